@@ -0,0 +1,193 @@
+# hot_paths.py
+
+import os, sys, time, json, platform, argparse, statistics
+
+# Run headless from the project root so settings can load sprites without opening a window
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+os.chdir(ROOT_DIR)
+
+import pygame
+import numpy as np
+from settings import *
+from maze import generate_maze
+from tilemap import generate_tiles
+from key import generate_keys
+from powerup import generate_powerups, POWERUP_CLASSES
+from enemy import EnemyAI, ENEMY_CLASSES
+from placement import PlacementIndex
+from camera import Camera
+from interface import bake_maze_surface, draw_maze
+from player import Player
+from game import GameState, start_mechanics, draw_game
+from audio_system import AudioSystem
+from hud import HUD
+
+DEFAULT_SIZES = [33, 61, 101, 151, 201, 301]
+MIN_ENEMY_SPAWN_DISTANCE = 12  # Tiles, more than an enemy covers in the frames of one sample
+
+def get_floor_for_size(size):
+    # Floor whose maze is size x size, mirrors the growth in start_mechanics
+    return (size - INIT_ROWS) // 2 * MAX_FLOOR_TO_INCREASE_MAZE_SIZE + 1
+
+def get_far_apart_path_tiles(maze):
+    # First and last enemy-walkable tiles in reading order, roughly opposite corners
+    tile_y, tile_x = np.nonzero(maze.walkable_mask('enemy'))
+    return (int(tile_x[0]), int(tile_y[0])), (int(tile_x[-1]), int(tile_y[-1]))
+
+# Each setup builds its inputs and returns the call that gets timed
+
+def setup_generate_maze(size, options):
+    return lambda: generate_maze(size, size)
+
+def setup_generate_tiles(size, options):
+    maze, _ = generate_maze(size, size)
+    return lambda: generate_tiles(maze)
+
+def setup_a_star(size, options):
+    maze, _ = generate_maze(size, size)
+    enemy = EnemyAI(1, 1, "pursuer")
+    start, goal = get_far_apart_path_tiles(maze)
+    return lambda: enemy.a_star(start, goal, maze, False)
+
+def setup_generate_keys(size, options):
+    maze, _ = generate_maze(size, size)
+    return lambda: generate_keys(maze, size // 2, size // 2)
+
+def setup_generate_powerups(size, options):
+    # The placement index is built once per floor, each spawn reuses it
+    maze, _ = generate_maze(size, size)
+    placement = PlacementIndex(maze, size // 2, size // 2)
+    return lambda: generate_powerups(maze, size // 2, size // 2, [], POWERUP_CLASSES, placement)
+
+def setup_start_mechanics(size, options):
+    player = Player(INIT_ROWS // 2, INIT_COLS // 2, INIT_SPEED_PLAYER)
+    player.floor = get_floor_for_size(size)
+    return lambda: start_mechanics(player)
+
+def setup_draw_maze(size, options):
+    maze, _ = generate_maze(size, size)
+    tile_map = generate_tiles(maze)
+    maze_surface = bake_maze_surface(maze, tile_map)  # None past MAX_BAKED_MAZE_PIXELS, then tiles are culled
+    camera = Camera(WIDTH, HEIGHT, size, size)
+    camera.follow((size // 2, size // 2), 1 / camera.smoothness)
+    return lambda: draw_maze(maze_surface, camera, tile_map)
+
+def setup_frame(size, options):
+    # One fixed simulation step plus the full draw with a fixed number of enemies, the player stands still
+    state = GameState(seed=RNG.getrandbits(32), prefetch=False)
+    state.player.floor = get_floor_for_size(size)
+    state.start_floor(state.player)
+
+    # Enemies spawn far enough away that none reaches the player within one sample
+    enemy_types = list(ENEMY_CLASSES)
+    tile_y, tile_x = np.nonzero(state.maze.walkable_mask('enemy'))
+    far_tiles = np.nonzero(np.abs(tile_x - state.player.x) + np.abs(tile_y - state.player.y) > MIN_ENEMY_SPAWN_DISTANCE)[0]
+    enemy_objects = []
+    for index in range(options.enemies):
+        tile = far_tiles[RNG.randrange(len(far_tiles))]
+        enemy_type = enemy_types[index % len(enemy_types)]
+        enemy_objects.append(ENEMY_CLASSES[enemy_type][0](int(tile_x[tile]), int(tile_y[tile]), enemy_type))
+    state.set_enemies(enemy_objects)
+
+    hud = HUD()
+    def run_frame():
+        state.start_frame()
+        if state.update(set(), FIXED_DT):
+            raise RuntimeError("The frame benchmark hit a game over, its timings would not be steady-state frames")
+        state.camera.follow((state.player.x, state.player.y), FIXED_DT)
+        draw_game(state, hud)
+    return run_frame
+
+# Name: (setup, calls per sample), frames are averaged over a run of steps so one-off rebuilds do not dominate
+BENCHMARKS = {
+    "generate_maze": (setup_generate_maze, 1),
+    "generate_tiles": (setup_generate_tiles, 1),
+    "a_star": (setup_a_star, 1),
+    "generate_keys": (setup_generate_keys, 1),
+    "generate_powerups": (setup_generate_powerups, 1),
+    "start_mechanics": (setup_start_mechanics, 1),
+    "draw_maze": (setup_draw_maze, 1),
+    "frame": (setup_frame, 30)
+}
+
+def time_benchmark(setup, calls, size, options):
+    # One untimed warm-up so lazy asset loads are not counted, then seeded timed repeats
+    timings = []
+    for repeat in range(options.repeats + 1):
+        RNG.seed(options.seed + repeat)
+        run = setup(size, options)
+        start_time = time.perf_counter()
+        for _ in range(calls):
+            run()
+        if repeat:
+            timings.append((time.perf_counter() - start_time) / calls)
+    return {
+        "best_ms": round(min(timings) * 1000, 4),
+        "median_ms": round(statistics.median(timings) * 1000, 4),
+        "mean_ms": round(statistics.mean(timings) * 1000, 4)
+    }
+
+def compare(results, baseline, threshold):
+    # Median time ratios against a stored run, anything slower than the threshold is a regression
+    regressions = []
+    for name, sizes in results.items():
+        for size, timing in sizes.items():
+            previous = baseline.get(name, {}).get(size)
+            if previous is None or previous["median_ms"] <= 0:
+                continue
+            ratio = timing["median_ms"] / previous["median_ms"]
+            if ratio > 1 + threshold:
+                regressions.append((name, size, previous["median_ms"], timing["median_ms"], ratio))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the generation, tiling, pathfinding and render hot paths per floor size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--only", nargs="+", choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--enemies", type=int, default=6, help="Enemies placed on the floor for the frame benchmark")
+    parser.add_argument("--output", help="Write results to this JSON file")
+    parser.add_argument("--baseline", help="Compare against a JSON file written by --output")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Allowed slowdown before a result counts as a regression")
+    options = parser.parse_args()
+
+    AudioSystem.muted = True
+    results = {}
+    print(f"{'benchmark':<18} {'size':>9} {'best ms':>10} {'median ms':>10}")
+    for name in options.only:
+        results[name] = {}
+        for size in options.sizes:
+            timing = time_benchmark(*BENCHMARKS[name], size, options)
+            results[name][str(size)] = timing
+            print(f"{name:<18} {size:>4}x{size:<4} {timing['best_ms']:>10.2f} {timing['median_ms']:>10.2f}")
+
+    if options.output:
+        with open(options.output, "w") as output_file:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "pygame": pygame.version.ver,
+                    "numpy": np.__version__,
+                    "machine": platform.machine(),
+                    "repeats": options.repeats,
+                    "seed": options.seed,
+                    "enemies": options.enemies
+                },
+                "results": results
+            }, output_file, indent=2)
+
+    if options.baseline:
+        with open(options.baseline) as baseline_file:
+            regressions = compare(results, json.load(baseline_file)["results"], options.threshold)
+        for name, size, previous, current, ratio in regressions:
+            print(f"REGRESSION {name} {size}x{size}: {previous:.2f} ms -> {current:.2f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {options.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
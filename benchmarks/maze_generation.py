@@ -0,0 +1,40 @@
+# maze_generation.py
+
+import os, sys, time, argparse
+
+# Run headless from the project root so settings can load sprites without opening a window
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+os.chdir(ROOT_DIR)
+
+from settings import RNG
+from maze import generate_maze
+
+DEFAULT_SIZES = [33, 61, 101, 201, 301, 401, 501]
+
+def time_generation(size, repeats, seed):
+    # Best and mean time of generating a size x size floor
+    timings = []
+    for repeat in range(repeats):
+        RNG.seed(seed + repeat)
+        start_time = time.perf_counter()
+        generate_maze(size, size)
+        timings.append(time.perf_counter() - start_time)
+    return min(timings), sum(timings) / len(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Time maze generation per floor size.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'size':>9} {'best ms':>10} {'mean ms':>10} {'us/cell':>9}")
+    for size in args.sizes:
+        best, mean = time_generation(size, args.repeats, args.seed)
+        print(f"{size:>4}x{size:<4} {best * 1000:>10.2f} {mean * 1000:>10.2f} {best * 1e6 / (size * size):>9.3f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+# pathfinding_check.py
+
+import os, sys, random, argparse
+from collections import deque
+
+# Run headless from the project root so settings can load sprites without opening a window
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+sys.path.insert(0, os.path.join(ROOT_DIR, "scripts"))
+os.chdir(ROOT_DIR)
+
+import numpy as np
+from settings import *
+from maze import generate_maze, toggle_door
+from maze_grid import MazeGrid
+from pathfinding import AStarPathfinder, DStarLitePathfinder
+
+MODES = ('enemy', 'wall_immune')
+NEIGHBOR_OFFSETS = ((1, 0), (-1, 0), (0, 1), (0, -1))
+
+def get_distance(maze, start, goal, mode):
+    # Breadth-first shortest path length, None when the goal cannot be reached
+    walkable = maze.walkable_mask(mode)
+    distances = {start: 0}
+    frontier = deque([start])
+    while frontier:
+        x, y = frontier.popleft()
+        if (x, y) == goal:
+            return distances[(x, y)]
+        for dx, dy in NEIGHBOR_OFFSETS:
+            nx, ny = x + dx, y + dy
+            if (nx, ny) not in distances and maze.in_bounds(nx, ny) and walkable[ny, nx]:
+                distances[(nx, ny)] = distances[(x, y)] + 1
+                frontier.append((nx, ny))
+    return None
+
+def get_path_error(maze, start, goal, mode, path, expected):
+    # Why a path is wrong for a query whose shortest length is expected, None when it is valid
+    if expected is None or expected == 0:
+        return None if path == [] else f"expected no steps, got {len(path)}"
+    if not path or path[-1] != goal:
+        return "does not end on the goal"
+    walkable = maze.walkable_mask(mode)
+    previous = start
+    for x, y in path:
+        if abs(x - previous[0]) + abs(y - previous[1]) != 1 or not walkable[y, x]:
+            return f"invalid step {previous} -> {(x, y)}"
+        previous = (x, y)
+    return None
+
+def make_maze(rng, size):
+    # Either a generated floor with its doors, or open ground with scattered walls
+    if rng.random() < 0.5:
+        maze, door_positions = generate_maze(size, size, rng)
+        return maze, door_positions
+    codes = np.random.default_rng(rng.getrandbits(32)).random((size, size)) < 0.3
+    return MazeGrid.from_codes(np.where(codes, 0, 1).astype(np.uint8)), []
+
+def get_random_cell(rng, maze, mode):
+    tile_y, tile_x = np.nonzero(maze.walkable_mask(mode))
+    index = rng.randrange(len(tile_x))
+    return int(tile_x[index]), int(tile_y[index])
+
+def check_astar(rng, maze, door_positions, failures, queries=20):
+    # Every answer is a shortest path, also when the search is cut into slices by an expired deadline
+    pathfinder = AStarPathfinder()
+    for mode in MODES:
+        for query in range(queries):
+            if door_positions and query % 5 == 4:
+                toggle_door(maze, door_positions, rng.choice(['locked', 'unlocked']))
+            start, goal = get_random_cell(rng, maze, mode), get_random_cell(rng, maze, mode)
+            expected = get_distance(maze, start, goal, mode)
+            if query % 2:
+                path = pathfinder.find_path(start, goal, maze, mode)
+            else:
+                path = None
+                while path is None:
+                    path = pathfinder.find_path(start, goal, maze, mode, deadline=0)
+            error = get_path_error(maze, start, goal, mode, path, expected)
+            if error is None and path and len(path) != expected:
+                error = f"{len(path)} steps, shortest is {expected}"
+            if error:
+                failures.append(f"astar {mode} {start}->{goal}: {error}")
+
+def check_dstar(rng, maze, failures, steps=60):
+    # Walk an enemy along its own paths while the goal wanders and tiles open and close. Paths stay valid and
+    # are at most two steps per tile of goal drift longer than the shortest one
+    pathfinder = DStarLitePathfinder()
+    mode = 'enemy'
+    start, goal = get_random_cell(rng, maze, mode), get_random_cell(rng, maze, mode)
+    excess = []
+    for step in range(steps):
+        path = pathfinder.find_path(start, goal, maze, mode)
+        expected = get_distance(maze, start, goal, mode)
+        error = get_path_error(maze, start, goal, mode, path, expected)
+        if error is None and path:
+            drift = abs(goal[0] - pathfinder.goal[0]) + abs(goal[1] - pathfinder.goal[1])
+            if not expected <= len(path) <= expected + 2 * drift:
+                error = f"{len(path)} steps, shortest is {expected} with a drift of {drift}"
+            excess.append(len(path) - expected)
+            start = path[0]
+        if error:
+            failures.append(f"dstar step {step} {start}->{goal}: {error}")
+            return excess
+
+        roll = rng.random()
+        if roll < 0.3:
+            # The goal steps to a neighbouring tile
+            options = [(goal[0] + dx, goal[1] + dy) for dx, dy in NEIGHBOR_OFFSETS if maze.is_walkable(goal[0] + dx, goal[1] + dy, mode)]
+            if options:
+                goal = rng.choice(options)
+        elif roll < 0.4:
+            # A tile somewhere opens or closes, like a door
+            x, y = rng.randrange(1, maze.cols - 1), rng.randrange(1, maze.rows - 1)
+            if (x, y) not in (start, goal):
+                maze.set_tile(x, y, 'X' if maze.tile(x, y) == 'O' else 'O')
+        elif roll < 0.42:
+            goal = get_random_cell(rng, maze, mode)  # A jump, like a teleport
+    return excess
+
+def main():
+    parser = argparse.ArgumentParser(description="Check the pathfinders against breadth-first search on random mazes.")
+    parser.add_argument("--seeds", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[21, 33, 61, 121])
+    args = parser.parse_args()
+
+    failures, excess = [], []
+    for seed in range(args.seed, args.seed + args.seeds):
+        rng = random.Random(seed)
+        size = rng.choice(args.sizes)
+        maze, door_positions = make_maze(rng, size)
+        check_astar(rng, maze, door_positions, failures)
+        excess += check_dstar(rng, make_maze(rng, size)[0], failures)
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"astar: shortest on every query over {args.seeds} seeds")
+    print(f"dstar: {len(excess)} paths, {sum(1 for value in excess if value)} longer than shortest, at most {max(excess, default=0)} extra steps")
+
+if __name__ == "__main__":
+    main()
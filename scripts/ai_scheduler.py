@@ -0,0 +1,58 @@
+# ai_scheduler.py
+
+import time
+from settings import *
+
+class AIScheduler:
+    def __init__(self, budget_ms=AI_BUDGET_MS):
+        self.budget = budget_ms / 1000 if budget_ms is not None else None  # None searches without a time limit
+        self.clock = 0.0  # Game time, think intervals never depend on the frame rate
+        self.next_think_time = {}
+        self.first_index = 0  # Enemy that gets the first chance to search next step
+        self.spent = 0.0  # Search time charged to the current frame
+
+        self.searches = 0
+        self.deferred = 0
+
+    def start_frame(self):
+        # One budget per rendered frame, however many fixed steps a slow frame has to catch up on
+        self.spent = 0.0
+
+    def get_think_interval(self, enemy, player, visible_range):
+        # Enemies the player cannot see, or that are far away, search less often
+        if visible_range is not None:
+            first_col, first_row, last_col, last_row = visible_range
+            if not (first_col <= enemy.x <= last_col and first_row <= enemy.y <= last_row):
+                return AI_OFFSCREEN_THINK_INTERVAL
+        if abs(enemy.x - player.x) + abs(enemy.y - player.y) > AI_NEAR_DISTANCE:
+            return AI_FAR_THINK_INTERVAL
+        return 0.0
+
+    def update(self, enemies, player, delta_time, move_enemy, visible_range=None):
+        # Move every enemy this step, handing out fresh path searches in round-robin order while the frame's budget lasts
+        self.clock += delta_time
+        first_denied = None
+        for offset in range(len(enemies)):
+            index = (self.first_index + offset) % len(enemies)
+            enemy = enemies[index]
+            over_budget = self.budget is not None and self.spent >= self.budget
+            enemy.may_think = not over_budget and self.clock >= self.next_think_time.get(enemy, 0.0)
+            enemy.searched = enemy.search_deferred = False
+
+            start_time = time.perf_counter()
+            enemy.think_deadline = None if self.budget is None else start_time + self.budget - self.spent
+            move_enemy(enemy)
+            if enemy.searched:
+                self.spent += time.perf_counter() - start_time
+                self.searches += 1
+            if enemy.search_deferred:
+                # Denied a search, or its search was cut short and should resume as soon as possible
+                self.deferred += 1
+                if (over_budget or enemy.searched) and first_denied is None:
+                    first_denied = index
+            elif enemy.searched:
+                self.next_think_time[enemy] = self.clock + self.get_think_interval(enemy, player, visible_range)
+
+        # Whoever ran out of budget first starts next step, otherwise the start rotates
+        if enemies:
+            self.first_index = first_denied if first_denied is not None else (self.first_index + 1) % len(enemies)
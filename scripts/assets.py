@@ -0,0 +1,119 @@
+# assets.py
+
+import pygame, time, threading
+from collections.abc import Mapping
+from utils import split_and_resize_sprite
+
+# Held around anything that reads or packs shared sprite surfaces, since floors are planned on a worker thread
+# and SDL refuses to blit from a surface another thread has locked
+SURFACE_LOCK = threading.RLock()
+
+class TextureAtlas:
+    def __init__(self, name, page_size=512):
+        self.name = name
+        self.page_size = page_size
+        self.pages = []
+
+        # Shelf packing cursor on the current page
+        self.cursor_x, self.cursor_y = 0, 0
+        self.shelf_height = 0
+
+    def add_frame(self, frame):
+        # Copy a frame into an atlas page and hand back a subsurface sharing the page pixels
+        width, height = frame.get_size()
+        if width > self.page_size or height > self.page_size:
+            return frame  # Too large to pack, keep it as its own surface
+
+        if self.cursor_x + width > self.page_size:
+            self.cursor_x, self.cursor_y = 0, self.cursor_y + self.shelf_height
+            self.shelf_height = 0
+        if not self.pages or self.cursor_y + height > self.page_size:
+            self.pages.append(pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA).convert_alpha())
+            self.pages[-1].fill((0, 0, 0, 0))
+            self.cursor_x, self.cursor_y = 0, 0
+            self.shelf_height = 0
+
+        frame_rect = pygame.Rect(self.cursor_x, self.cursor_y, width, height)
+        self.pages[-1].blit(frame, frame_rect, special_flags=pygame.BLEND_RGBA_MAX)  # Exact copy onto the cleared page
+        self.cursor_x += width
+        self.shelf_height = max(self.shelf_height, height)
+        return self.pages[-1].subsurface(frame_rect)
+
+class AssetGroup(Mapping):
+    def __init__(self, name, paths, tile_size=0, atlas=None, single_frame=False):
+        self.name = name
+        self.paths = paths
+        self.tile_size = tile_size
+        self.atlas = atlas
+        self.single_frame = single_frame
+        self.frames = {}  # Each sheet is loaded on first use
+
+        # Load statistics for the report
+        self.load_time = 0.0
+        self.byte_size = 0
+        self.frame_count = 0
+
+    def load(self, state):
+        start_time = time.perf_counter()
+        frames = split_and_resize_sprite(self.paths[state], self.tile_size)
+        if self.atlas is not None:
+            frames = [self.atlas.add_frame(frame) for frame in frames]
+        self.frame_count += len(frames)
+        self.byte_size += sum(frame.get_width() * frame.get_height() * frame.get_bytesize() for frame in frames)
+        self.frames[state] = frames[0] if self.single_frame else frames
+        self.load_time += time.perf_counter() - start_time
+
+    def __getitem__(self, state):
+        if state not in self.frames:
+            with SURFACE_LOCK:
+                if state not in self.frames:
+                    self.load(state)
+        return self.frames[state]
+
+    def __contains__(self, state):
+        # Key checks never force a load
+        return state in self.paths
+
+    def __iter__(self):
+        return iter(self.paths)
+
+    def __len__(self):
+        return len(self.paths)
+
+class AssetRegistry:
+    def __init__(self):
+        self.groups = {}
+        self.atlases = {}
+
+    def get_atlas(self, name):
+        if name not in self.atlases:
+            self.atlases[name] = TextureAtlas(name)
+        return self.atlases[name]
+
+    def group(self, name, paths, tile_size=0, atlas=None, single_frame=False):
+        # Register a group of sprite sheets, nothing is read from disk until a frame is requested
+        if name not in self.groups:
+            self.groups[name] = AssetGroup(name, paths, tile_size, self.get_atlas(atlas) if atlas else None, single_frame)
+        return self.groups[name]
+
+    def animations(self, name, paths):
+        # Animation frames shared by every instance of a player or enemy type
+        return self.group(name, paths, atlas="entities")
+
+    def report(self):
+        # Load time, bytes and frame count per asset group that has been used
+        return {
+            name: {
+                "load_ms": round(group.load_time * 1000, 2),
+                "bytes": group.byte_size,
+                "frames": group.frame_count,
+                "atlas": group.atlas.name if group.atlas else None
+            }
+            for name, group in self.groups.items()
+            if group.frames
+        }
+
+    def atlas_page_count(self):
+        return sum(len(atlas.pages) for atlas in self.atlases.values())
+
+ASSETS = AssetRegistry()
@@ -1,15 +1,31 @@
 # audio_system.py
 
-import pygame, random, threading
+import pygame, random, itertools
 from pygame import mixer
-from settings import AUDIO
+from settings import AUDIO, SFX_CHANNELS, SFX_PRIORITIES, AMBIENT_DISTANCE_FALLOFF, AMBIENT_HEARING_DISTANCE, AMBIENT_MIN_VOLUME
 
 # Initialize the Pygame mixer
 mixer.init()
 
+class LoopingSfx:
+    def __init__(self, duration_range, source):
+        self.duration_range = duration_range  # Seconds between restarts, picked at random each period
+        self.source = source  # Object with x, y whose distance to the listener sets the volume, or None
+        self.time_left = 0
+
+    def get_volume(self, listener):
+        if not AMBIENT_DISTANCE_FALLOFF or self.source is None or listener is None:
+            return 1.0
+        distance = ((self.source.x - listener[0]) ** 2 + (self.source.y - listener[1]) ** 2) ** 0.5
+        return max(AMBIENT_MIN_VOLUME, 1.0 - distance / AMBIENT_HEARING_DISTANCE)
+
 class AudioSystem:
-    _playing_sfx = {}  # Tracks currently playing SFX by ID
-    _looping_sfx_threads = {}  # Tracks threads for looping SFX by ID
+    _playing_sfx = {}  # Tracks currently playing SFX by ID as (channel, priority, play order)
+    _sounds = {}  # Decoded sounds by file path
+    _channels = []  # Reserved channels for SFX
+    _play_order = itertools.count()
+    _looping_sfx = {}  # Ambient loops by ID, restarted from update
+    muted = False  # Headless runs skip all playback
     
     @staticmethod
     def _get_random_path(audio_paths):
@@ -23,6 +39,8 @@ class AudioSystem:
         # Play the specified music track
         if music_id not in AUDIO['music']:
             raise ValueError(f"Music ID '{music_id}' not found in AUDIO['music'].")
+        if AudioSystem.muted:
+            return
         
         # Stop any currently playing music
         mixer.music.stop()
@@ -39,72 +57,126 @@ class AudioSystem:
         mixer.music.stop()
     
     @staticmethod
-    def play_sfx(sfx_id, should_loop=False, offset=0.0, duration_range=(0.0, 0.0)):
-        # Play the specified sound effect
-        if sfx_id not in AUDIO['sfx']:
-            raise ValueError(f"SFX ID '{sfx_id}' not found in AUDIO['sfx'].")
+    def get_sound(sfx_path):
+        # Decode each file once and reuse the Sound afterwards
+        sound = AudioSystem._sounds.get(sfx_path)
+        if sound is None:
+            sound = mixer.Sound(sfx_path)
+            AudioSystem._sounds[sfx_path] = sound
+        return sound
 
-        # Check if the SFX is already playing
-        if sfx_id in AudioSystem._playing_sfx:
+    @staticmethod
+    def preload():
+        # Decode every sound effect up front so the first play never reads from disk
+        for audio_paths in AUDIO['sfx'].values():
+            for sfx_path in (audio_paths if isinstance(audio_paths, list) else [audio_paths]):
+                AudioSystem.get_sound(sfx_path)
+
+    @staticmethod
+    def _get_channel_pool():
+        # Reserve the first channels for sound effects so Sound.play() elsewhere never takes them
+        if not AudioSystem._channels:
+            mixer.set_num_channels(max(mixer.get_num_channels(), SFX_CHANNELS * 2))
+            mixer.set_reserved(SFX_CHANNELS)
+            AudioSystem._channels = [mixer.Channel(index) for index in range(SFX_CHANNELS)]
+        return AudioSystem._channels
+
+    @staticmethod
+    def _release_finished():
+        for sfx_id, (channel, _, _) in list(AudioSystem._playing_sfx.items()):
+            if not channel.get_busy():
+                del AudioSystem._playing_sfx[sfx_id]
+
+    @staticmethod
+    def _acquire_channel(priority):
+        # A free pooled channel, otherwise steal the oldest voice with the lowest priority not above ours
+        AudioSystem._release_finished()
+        if not AudioSystem._playing_sfx:
+            return AudioSystem._get_channel_pool()[0]
+        used_channels = {playing[0] for playing in AudioSystem._playing_sfx.values()}
+        for channel in AudioSystem._get_channel_pool():
+            if channel not in used_channels and not channel.get_busy():
+                return channel
+
+        victim_id, victim = min(AudioSystem._playing_sfx.items(), key=lambda item: (item[1][1], item[1][2]))
+        if victim[1] > priority:
+            return None  # Everything playing matters more, drop this sound
+        victim[0].stop()
+        del AudioSystem._playing_sfx[victim_id]
+        return victim[0]
+
+    @staticmethod
+    def _play_pooled(sfx_id, maxtime=0, volume=1.0):
+        sound = AudioSystem.get_sound(AudioSystem._get_random_path(AUDIO['sfx'][sfx_id]))
+        if maxtime >= sound.get_length() * 1000:
+            maxtime = 0  # Plays to the end anyway
+        priority = SFX_PRIORITIES.get(sfx_id, 0)
+        channel = AudioSystem._acquire_channel(priority)
+        if channel is None:
             return
+        channel.set_volume(volume)
+        channel.play(sound, maxtime=maxtime)
+        AudioSystem._playing_sfx[sfx_id] = (channel, priority, next(AudioSystem._play_order))
 
-        # Get a random path for the sound effect
-        sfx_path = AudioSystem._get_random_path(AUDIO['sfx'][sfx_id])
-        sound = mixer.Sound(sfx_path)
+    @staticmethod
+    def update(delta_time=0.0, listener=None):
+        # Called once per frame: frees finished channels and restarts ambient loops whose period ran out
+        AudioSystem._release_finished()
+        for sfx_id, loop in AudioSystem._looping_sfx.items():
+            loop.time_left -= delta_time
+            if loop.time_left <= 0:
+                # A new period cuts the previous one off, like the old loop thread did
+                AudioSystem._stop_channel(sfx_id)
+                loop.time_left = random.uniform(*loop.duration_range)
+                AudioSystem._play_pooled(sfx_id, int(loop.time_left * 1000), loop.get_volume(listener))
+            elif loop.source is not None and listener is not None and sfx_id in AudioSystem._playing_sfx:
+                AudioSystem._playing_sfx[sfx_id][0].set_volume(loop.get_volume(listener))
 
-        def loop_sfx(stop_event):
-            # Handle looping SFX with random durations
-            while not stop_event.is_set():
-                channel = sound.play()
-                duration = random.uniform(*duration_range) if duration_range else sound.get_length()
-                pygame.time.delay(int(duration * 1000))
-                channel.stop()
+    @staticmethod
+    def play_sfx(sfx_id, should_loop=False, offset=0.0, duration_range=(0.0, 0.0), source=None):
+        # Play the specified sound effect, looping ones are restarted by update with random periods
+        if sfx_id not in AUDIO['sfx']:
+            raise ValueError(f"SFX ID '{sfx_id}' not found in AUDIO['sfx'].")
+        if AudioSystem.muted:
+            return
 
         if should_loop:
             if not duration_range:
                 raise ValueError("Duration range must be provided for looping SFX.")
-            # Start a thread for looping the SFX
-            stop_event = threading.Event()
-            AudioSystem._looping_sfx_threads[sfx_id] = stop_event
-            threading.Thread(target=loop_sfx, args=(stop_event,), daemon=True).start()
-        else:
-            # Play the sound effect once
-            channel = sound.play()
-            AudioSystem._playing_sfx[sfx_id] = channel
-            if offset > 0.0:
-                duration = sound.get_length()
-                if offset < duration:
-                    pygame.time.delay(int(offset * 1000))
-                    channel.stop()
-
-            # Create a thread to monitor the channel and remove it once playback ends
-            def monitor_sfx():
-                while channel.get_busy():  # Wait for the sound to finish playing
-                    pygame.time.delay(100)
-                # Remove the completed SFX from the list
-                AudioSystem._playing_sfx.pop(sfx_id, None)
-
-            threading.Thread(target=monitor_sfx, daemon=True).start()
+            if sfx_id not in AudioSystem._looping_sfx:
+                AudioSystem._looping_sfx[sfx_id] = LoopingSfx(duration_range, source)  # Starts on the next update
+            return
+
+        # Check if the SFX is already playing
+        playing = AudioSystem._playing_sfx.get(sfx_id)
+        if playing is not None and playing[0].get_busy():
+            return
+
+        # Play the sound effect once, an offset cuts it short after that many seconds
+        AudioSystem._play_pooled(sfx_id, int(offset * 1000))
+
+    @staticmethod
+    def _stop_channel(sfx_id):
+        if sfx_id in AudioSystem._playing_sfx:
+            channel = AudioSystem._playing_sfx.pop(sfx_id)[0]
+            channel.stop()
 
     @staticmethod
     def stop_sfx(sfx_id):
         # Stop the specified SFX from playing
-        if sfx_id in AudioSystem._looping_sfx_threads:
-            stop_event = AudioSystem._looping_sfx_threads.pop(sfx_id)
-            stop_event.set()  # Signal the thread to stop
+        AudioSystem._looping_sfx.pop(sfx_id, None)
+        AudioSystem._stop_channel(sfx_id)
 
-        if sfx_id in AudioSystem._playing_sfx:
-            channel = AudioSystem._playing_sfx.pop(sfx_id)
-            channel.stop()
+    @staticmethod
+    def stop_source_sfx(source):
+        # Stop the looping SFX that follow a removed object
+        for sfx_id in [sfx_id for sfx_id, loop in AudioSystem._looping_sfx.items() if loop.source is source]:
+            AudioSystem.stop_sfx(sfx_id)
 
     @staticmethod
     def stop_all_sfx():
-        # Stop all looping SFX
-        for sfx_id, stop_event in list(AudioSystem._looping_sfx_threads.items()):
-            stop_event.set()
-            del AudioSystem._looping_sfx_threads[sfx_id]
-        
-        # Stop all single-play SFX
-        for sfx_id, channel in list(AudioSystem._playing_sfx.items()):
+        # Stop all looping and single-play SFX
+        AudioSystem._looping_sfx.clear()
+        for channel, _, _ in AudioSystem._playing_sfx.values():
             channel.stop()
-            del AudioSystem._playing_sfx[sfx_id]
\ No newline at end of file
+        AudioSystem._playing_sfx.clear()
@@ -8,6 +8,8 @@ class Camera:
         self.camera = pygame.Rect(0, 0, width, height)
         self.width = width
         self.height = height
+        self.rows = rows
+        self.cols = cols
         self.smoothness = 0.5  # Controls how fast the camera moves in pixels per second
         
         # Maximum distance the camera will "peek" at the player based on screen dimensions
@@ -41,8 +43,22 @@ class Camera:
 
     def apply(self, entity):
         # Adjust entity position by camera offset for rendering
-        return entity.rect.move(-self.camera.topleft[0], -self.camera.topleft[1])
+        return (entity.rect.x - self.camera.left, entity.rect.y - self.camera.top)
+
+    def apply_interpolated(self, entity, alpha):
+        # Blend between the last two simulation steps so movement stays smooth at any frame rate
+        x = entity.previous_float_x + (entity.float_x - entity.previous_float_x) * alpha
+        y = entity.previous_float_y + (entity.float_y - entity.previous_float_y) * alpha
+        return (int(x * TILE_SIZE) - self.camera.left, int(y * TILE_SIZE) - self.camera.top)
 
     def apply_to_maze(self, x, y):
         # Adjust maze tile position by camera offset
         return (x * TILE_SIZE - self.camera.left, y * TILE_SIZE - self.camera.top)
+
+    def get_visible_tile_range(self, margin=0):
+        # Range of tiles overlapping the viewport, padded by a margin for sprites drawn past their tile
+        first_col = max(0, self.camera.left // TILE_SIZE - margin)
+        first_row = max(0, self.camera.top // TILE_SIZE - margin)
+        last_col = min(self.cols, self.camera.right // TILE_SIZE + 1 + margin)
+        last_row = min(self.rows, self.camera.bottom // TILE_SIZE + 1 + margin)
+        return first_col, first_row, last_col, last_row
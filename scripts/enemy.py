@@ -1,29 +1,44 @@
 # enemy.py
 
-import pygame, math, random, time
-from queue import PriorityQueue
+import pygame, math
 from settings import *
-from utils import split_and_resize_sprite
+from pathfinding import get_pathfinder
 from audio_system import AudioSystem
 
 class EnemyAI:
+    # Cached path reuse across every enemy, to measure how many searches the cache saves
+    path_cache_hits = 0
+    path_cache_misses = 0
+
     def __init__(self, x, y, enemy_type):
         self.x, self.y = x, y
         self.enemy_type = enemy_type
 
         self.float_x, self.float_y = x, y
+        self.previous_float_x, self.previous_float_y = x, y  # Position at the start of the last step
         self.start_pos = (x, y)
         self.target_pos = (x, y)
         self.is_moving = False
         self.elapsed_time = 0
+
+        # Last planned path, stored goal first so the next step pops off the end
+        self.path = []
+        self.path_goal = None
+        self.path_version = None
+        self.path_is_immune_to_wall = False
+        self.path_steps = 0
+
+        # Set by the AI scheduler around each move: whether a fresh search is allowed and what happened
+        self.may_think = True
+        self.think_deadline = None  # perf_counter time searches stop at to resume later, None for no limit
+        self.searched = False
+        self.search_deferred = False
         
         # Load speed and animations from ENEMIES dictionary
         self.speed = ENEMIES[enemy_type]["init_speed"]
         self.speed_multiplier = 1.0
-        self.animations = {
-            state: split_and_resize_sprite(path)
-            for state, path in ENEMIES[enemy_type]["sprites"].items()
-        }
+        self.pathfinder = get_pathfinder(ENEMIES[enemy_type]["pathfinder"])
+        self.animations = ASSETS.animations(enemy_type, ENEMIES[enemy_type]["sprites"])  # Frames shared by every instance
         
         # Load animation states
         self.current_state = "right"  # Start in default state
@@ -38,48 +53,83 @@ class EnemyAI:
         # Euclidean distance
         return math.sqrt((x1 - x2) ** 2 + (y1 - y2) ** 2)
 
-    def a_star(self, start, goal, maze, is_immune_to_wall):
-        open_set = PriorityQueue()
-        open_set.put((0, start))
-        came_from = {}
-        g_score = {start: 0}
-        f_score = {start: self.heuristic(*start, *goal)}
-
-        def is_walkable(tile):
-            return tile in {'O'} or (is_immune_to_wall and tile in {'X', 'S', 'P', 'DL', 'DU', 'DI'})
-
-        while not open_set.empty():
-            current = open_set.get()[1]
-
-            if current == goal:
-                path = []
-                while current in came_from:
-                    path.append(current)
-                    current = came_from[current]
-                path.reverse()
-                return path
-
-            x, y = current
-            neighbors = [(x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)]
-
-            for nx, ny in neighbors:
-                if 0 <= nx < len(maze[0]) and 0 <= ny < len(maze) and is_walkable(maze[ny][nx]):
-                    temp_g_score = g_score[current] + 1
-                    if temp_g_score < g_score.get((nx, ny), float('inf')):
-                        came_from[(nx, ny)] = current
-                        g_score[(nx, ny)] = temp_g_score
-                        f_score[(nx, ny)] = temp_g_score + self.heuristic(nx, ny, *goal)
-                        open_set.put((f_score[(nx, ny)], (nx, ny)))
-
-        return []
-
-    def move(self, player_pos, maze, delta_time, is_immune_to_wall=False):
+    def a_star(self, start, goal, maze, is_immune_to_wall, deadline=None):
+        # Steps from start to goal with this enemy type's search, empty when the goal cannot be reached, None when cut short
+        return self.pathfinder.find_path(start, goal, maze, 'wall_immune' if is_immune_to_wall else 'enemy', deadline)
+
+    def get_next_move(self, target, maze, is_immune_to_wall, navigation):
+        start = (int(self.float_x), int(self.float_y))
+
+        # Read the shared flow field when chasing the same goal, otherwise search on our own
+        if navigation is not None and navigation.has_field_for(target):
+            if navigation.is_settled(start, is_immune_to_wall):
+                return navigation.next_step(start, is_immune_to_wall)
+            if self.may_think:
+                # The shared search has to reach this tile first, that work counts against the budget
+                self.searched = True
+                next_move = navigation.next_step(start, is_immune_to_wall, self.think_deadline)
+                if next_move is not None:
+                    return next_move
+            self.search_deferred = True
+            return navigation.stale_step(start, is_immune_to_wall)
+
+        if self.can_reuse_path(start, target, maze, is_immune_to_wall):
+            EnemyAI.path_cache_hits += 1
+        elif not self.may_think:
+            # No search granted this step: keep walking the old path while its next tile is open, otherwise wait
+            self.search_deferred = True
+            if not self.path or abs(self.path[-1][0] - start[0]) + abs(self.path[-1][1] - start[1]) != 1:
+                return None
+            if not maze.is_walkable(*self.path[-1], 'wall_immune' if self.path_is_immune_to_wall else 'enemy'):
+                return None
+        else:
+            self.searched = True
+            path = self.a_star(start, target, maze, is_immune_to_wall, self.think_deadline)
+            if path is None:
+                # Out of budget partway, stay on this tile so the same search resumes next frame
+                self.search_deferred = True
+                return None
+            EnemyAI.path_cache_misses += 1
+            self.path = path[::-1]
+            self.path_goal = target
+            self.path_version = maze.version
+            self.path_is_immune_to_wall = is_immune_to_wall
+            self.path_steps = 0
+
+        if not self.path:
+            return None
+        self.path_steps += 1
+        return self.path.pop()
+
+    def can_reuse_path(self, start, target, maze, is_immune_to_wall):
+        # Keep following the last path unless it went stale, no longer starts here, lost the goal or got blocked
+        if not self.path or self.path_steps >= ENEMY_PATH_STALENESS_LIMIT or is_immune_to_wall != self.path_is_immune_to_wall:
+            return False
+        next_x, next_y = self.path[-1]
+        if abs(next_x - start[0]) + abs(next_y - start[1]) != 1:
+            return False
+
+        if target != self.path_goal:
+            # A goal that moved along the path only shortens it
+            if target not in self.path:
+                return False
+            del self.path[:self.path.index(target)]
+            self.path_goal = target
+
+        if maze.version != self.path_version:
+            # Doors changed somewhere, only the tiles still ahead matter
+            walkable = maze.walkable_mask('wall_immune' if is_immune_to_wall else 'enemy')
+            if not all(walkable[y, x] for x, y in self.path):
+                return False
+            self.path_version = maze.version
+        return True
+
+    def move(self, player_pos, maze, delta_time, is_immune_to_wall=False, navigation=None):
         if not self.is_moving:
-            # Calculate new path if not moving
-            path = self.a_star((int(self.float_x), int(self.float_y)), player_pos, maze, is_immune_to_wall)
-            if path:
+            # Calculate next step if not moving
+            next_move = self.get_next_move(player_pos, maze, is_immune_to_wall, navigation)
+            if next_move:
                 # Set the next tile in path as the target
-                next_move = path[0]
                 self.start_pos = (self.float_x, self.float_y)
                 self.target_pos = next_move
                 self.is_moving = True
@@ -124,12 +174,14 @@ class EnemyAI:
             self.animation_timer = 0
             self.frame_index = (self.frame_index + 1) % len(frames)
 
-    def draw(self, win, camera, offset_y):
-        # Adjust position by camera and draw enemy
-        adjusted_rect = camera.apply(self)
+    def store_previous_position(self):
+        self.previous_float_x, self.previous_float_y = self.float_x, self.float_y
+
+    def get_blit(self, camera, offset_y, alpha=1.0):
+        # Adjust position by camera and return the enemy frame for batched drawing
+        x, y = camera.apply_interpolated(self, alpha)
         current_frame = self.animations[self.current_state][self.frame_index]
-        adjusted_rect = adjusted_rect.move(-current_frame.get_width() // 4, (-current_frame.get_height() // 4) + offset_y)
-        win.blit(current_frame, adjusted_rect)
+        return current_frame, (x - current_frame.get_width() // 4, y - current_frame.get_height() // 4 + offset_y)
 
 
 # Subclasses for each enemy
@@ -137,12 +189,12 @@ class EnemyAI:
 class Pursuer(EnemyAI):
     def __init__(self, x, y, enemy_type):
         super().__init__(x, y, enemy_type)
-        AudioSystem.play_sfx("pursuer_ambient", True, 0.0, (12.0, 18.0))
+        AudioSystem.play_sfx("pursuer_ambient", True, 0.0, (12.0, 18.0), source=self)
     
-    def move(self, player, maze, delta_time):
+    def move(self, player, maze, delta_time, navigation=None):
         # Target the player directly
         target = (player.x, player.y)
-        super().move(target, maze, delta_time)
+        super().move(target, maze, delta_time, navigation=navigation)
 
 class Feigner(EnemyAI):
     def __init__(self, x, y, enemy_type):
@@ -150,15 +202,13 @@ class Feigner(EnemyAI):
         self.random_target = None
         self.init_distance_away_from_player = 9
         self.init_distance_target_from_player = 9
-        AudioSystem.play_sfx("feigner_ambient", True, 0.0, (20.0, 30.0))
+        AudioSystem.play_sfx("feigner_ambient", True, 0.0, (20.0, 30.0), source=self)
 
-    def get_random_distant_target(self, player, maze):
-        while True:
-            rand_x, rand_y = random.randint(0, len(maze[0]) - 1), random.randint(0, len(maze) - 1)
-            if maze[rand_y][rand_x] == 'O' and self.heuristic(rand_x, rand_y, player.x, player.y) < self.init_distance_target_from_player + (math.floor((player.floor - 1) * (1 / MAX_FLOOR_TO_INCREASE_MAZE_SIZE)) * 2):
-                return (rand_x, rand_y)
+    def get_random_distant_target(self, player, navigation):
+        radius = self.init_distance_target_from_player + (math.floor((player.floor - 1) * (1 / MAX_FLOOR_TO_INCREASE_MAZE_SIZE)) * 2)
+        return navigation.walkable_cells.sample_within(player.x, player.y, radius)
 
-    def move(self, player, maze, delta_time):
+    def move(self, player, maze, delta_time, navigation=None):
         distance = self.heuristic(self.x, self.y, player.x, player.y)
 
         # Decide target based on distance to player
@@ -168,11 +218,11 @@ class Feigner(EnemyAI):
         else:
             # Use existing random target or find a new one if reached
             if not self.random_target or (self.x, self.y) == self.random_target:
-                self.random_target = self.get_random_distant_target(player, maze)
-            target = self.random_target
+                self.random_target = self.get_random_distant_target(player, navigation)
+            target = self.random_target or (player.x, player.y)  # No open cell qualifies, keep after the player
 
         # Move towards the chosen target
-        super().move(target, maze, delta_time)
+        super().move(target, maze, delta_time, navigation=navigation)
 
 class Glimmer(EnemyAI):
     def __init__(self, x, y, enemy_type):
@@ -180,15 +230,13 @@ class Glimmer(EnemyAI):
         self.random_target = None
         self.init_distance_away_from_player = 9
         self.init_distance_target_from_player = 9
-        AudioSystem.play_sfx("glimmer_ambient", True, 0.0, (9.5, 16.5))
+        AudioSystem.play_sfx("glimmer_ambient", True, 0.0, (9.5, 16.5), source=self)
 
-    def get_random_distant_target(self, player, maze):
-        while True:
-            rand_x, rand_y = random.randint(0, len(maze[0]) - 1), random.randint(0, len(maze) - 1)
-            if maze[rand_y][rand_x] == 'O' and self.heuristic(rand_x, rand_y, player.x, player.y) > self.init_distance_target_from_player + (math.floor((player.floor - 1) * (1 / MAX_FLOOR_TO_INCREASE_MAZE_SIZE)) * 2):
-                return (rand_x, rand_y)
+    def get_random_distant_target(self, player, navigation):
+        radius = self.init_distance_target_from_player + (math.floor((player.floor - 1) * (1 / MAX_FLOOR_TO_INCREASE_MAZE_SIZE)) * 2)
+        return navigation.walkable_cells.sample_outside(player.x, player.y, radius)
 
-    def move(self, player, maze, delta_time):
+    def move(self, player, maze, delta_time, navigation=None):
         distance = self.heuristic(self.x, self.y, player.x, player.y)
 
         # Decide target based on distance to player
@@ -198,18 +246,18 @@ class Glimmer(EnemyAI):
         else:
             # Use existing random target or find a new one if reached
             if not self.random_target or (self.x, self.y) == self.random_target:
-                self.random_target = self.get_random_distant_target(player, maze)
-            target = self.random_target
+                self.random_target = self.get_random_distant_target(player, navigation)
+            target = self.random_target or (player.x, player.y)  # No open cell qualifies, keep after the player
 
         # Move towards the chosen target
-        super().move(target, maze, delta_time)
+        super().move(target, maze, delta_time, navigation=navigation)
 
 class Ambusher(EnemyAI):
     def __init__(self, x, y, enemy_type):
         super().__init__(x, y, enemy_type)
-        AudioSystem.play_sfx("ambusher_ambient", True, 0.0, (17.5, 23.5))
+        AudioSystem.play_sfx("ambusher_ambient", True, 0.0, (17.5, 23.5), source=self)
     
-    def move(self, player, maze, delta_time):
+    def move(self, player, maze, delta_time, navigation=None):
         direction_map = {
             "up": (0, -1),
             "down": (0, 1),
@@ -225,10 +273,10 @@ class Ambusher(EnemyAI):
         # Ensure target is within maze bounds and not a wall
         target_x, target_y = target
         if 0 <= target_x < len(maze[0]) and 0 <= target_y < len(maze) and maze[target_y][target_x] == 'O':
-            super().move(target, maze, delta_time)
+            super().move(target, maze, delta_time, navigation=navigation)
         else:
             # Fallback: if the tile is outside bounds or blocked, target the player's position
-            super().move((player.x, player.y), maze, delta_time)
+            super().move((player.x, player.y), maze, delta_time, navigation=navigation)
 
 class Specter(EnemyAI):
     def __init__(self, x, y, enemy_type):
@@ -237,14 +285,16 @@ class Specter(EnemyAI):
         self.last_visited_time = None
         self.double_speed = self.speed * 2
         self.half_speed = self.speed / 2
-        self.cooldown_timer = 0
+        self.clock = 0  # Game time seen by this enemy, advanced by delta_time
         self.cooldown_duration = 3.0
+        self.cooldown_timer = -self.cooldown_duration  # First dash is ready straight away
         self.active_timer = 0
         self.active_duration = 3.0
         self.is_doubled_speed_active = False
 
-    def move(self, player, maze, delta_time):
-        current_time = time.time()
+    def move(self, player, maze, delta_time, navigation=None):
+        self.clock += delta_time
+        current_time = self.clock
 
         if self.is_doubled_speed_active:
             # If doubled speed is active, target last visited position
@@ -282,7 +332,7 @@ class Specter(EnemyAI):
                 self.frame_index = 0
                 self.previous_state = self.current_state
 
-        super().move(target, maze, delta_time)
+        super().move(target, maze, delta_time, navigation=navigation)
 
 class Slender(EnemyAI):
     def __init__(self, x, y, enemy_type):
@@ -290,7 +340,7 @@ class Slender(EnemyAI):
         self.wall_pass_enabled = False
         self.wall_pass_threshold = 7  # Distance to enable passing through walls
 
-    def move(self, player, maze, delta_time):
+    def move(self, player, maze, delta_time, navigation=None):
         # Calculate distance to player
         distance = self.heuristic(self.x, self.y, player.x, player.y)
 
@@ -315,7 +365,7 @@ class Slender(EnemyAI):
                 self.previous_state = self.current_state
 
         target = (player.x, player.y)
-        super().move(target, maze, delta_time, self.wall_pass_enabled)
+        super().move(target, maze, delta_time, self.wall_pass_enabled, navigation)
 
 
 ENEMY_CLASSES = {
@@ -1,6 +1,7 @@
 # game.py
 
 import pygame, random
+from concurrent.futures import ThreadPoolExecutor
 from settings import *
 from interface import *
 from player import Player
@@ -10,41 +11,51 @@ from key import *
 from powerup import *
 from tilemap import *
 from camera import Camera
+from navigation import Navigation
 from audio_system import AudioSystem
+from hud import HUD
+from metrics import METRICS
+from scheduler import Scheduler
+from ai_scheduler import AIScheduler
+from placement import PlacementIndex
+from spatial import TileIndex
+
+
+MOVEMENT_ACTIONS = {
+    'up': (0, -1),
+    'down': (0, 1),
+    'left': (-1, 0),
+    'right': (1, 0)
+}
+
+class FloorPlan:
+    # Everything about a floor that needs no window, so it can be prepared off the main thread
+    def __init__(self, floor, rows, cols, maze, door_positions, keys, enemy_spawns, placement, tile_map, maze_surface):
+        self.floor = floor
+        self.rows, self.cols = rows, cols
+        self.maze = maze
+        self.door_positions = door_positions
+        self.keys = keys
+        self.enemy_spawns = enemy_spawns  # (enemy type, x, y)
+        self.placement = placement
+        self.tile_map = tile_map
+        self.maze_surface = maze_surface
+
+def plan_floor(floor, seed, render=True):
+    # Lay out a whole floor from its own seed, independent of anything else drawing from the run's RNG
+    rng = random.Random(seed)
 
-
-def start_mechanics(existing_player=None):
-    AudioSystem.stop_all_sfx()
     # Calculate rows and cols based on the player floor
-    rows = INIT_ROWS
-    cols = INIT_COLS
-    
-    # Player spawns in the center of the player safe zone
-    if existing_player:
-        player = existing_player
-        
-        # Calculate rows and cols based on the player floor
-        rows = rows + (math.floor((player.floor - 1) * (1 / MAX_FLOOR_TO_INCREASE_MAZE_SIZE)) * 2)
-        cols = cols + (math.floor((player.floor - 1) * (1 / MAX_FLOOR_TO_INCREASE_MAZE_SIZE)) * 2)
-        
-        player.x, player.y = rows // 2, cols // 2  # Reset player position
-        player.float_x, player.float_y = player.x, player.y
-        player.safe_zone_pos = (player.x, player.y)
-        player.target_pos = (player.x, player.y)
-        player.current_tile = ''
-    else:
-        # Player spawns in the center of the player safe zone
-        player = Player(rows // 2, cols // 2, INIT_SPEED_PLAYER)
+    rows = INIT_ROWS + (math.floor((floor - 1) * (1 / MAX_FLOOR_TO_INCREASE_MAZE_SIZE)) * 2)
+    cols = INIT_COLS + (math.floor((floor - 1) * (1 / MAX_FLOOR_TO_INCREASE_MAZE_SIZE)) * 2)
+    center_x, center_y = rows // 2, cols // 2  # Player safe zone
 
-    enemies = get_enemies(player)
+    enemies = get_enemies(floor, rng)
+    maze, door_positions = generate_maze(rows, cols, rng)
+    keys = generate_keys(maze, center_x, center_y, rng=rng)
 
-    enemy_objects = []
-    maze, door_positions = generate_maze(rows, cols)
-    keys = generate_keys(maze, player.safe_zone_pos[0], player.safe_zone_pos[1])
-    used_positions = set()  # Set to track used (x, y) coordinates
-
-    # Instantiate each enemy and assign positions
-    assigned_positions = []  # List to track assigned positions
+    # Assign spawn positions to each enemy
+    enemy_spawns = []
     remaining_enemies = list(enemies)  # Create a copy of enemies to track unassigned ones
 
     while remaining_enemies:
@@ -53,32 +64,87 @@ def start_mechanics(existing_player=None):
         # Assign up to 4 positions in this batch
         for _ in range(min(4, len(remaining_enemies))):
             while True:
-                enemy_x = random.choice([1, rows - 4])
-                enemy_y = random.choice([1, cols - 4])
+                enemy_x = rng.choice([1, rows - 4])
+                enemy_y = rng.choice([1, cols - 4])
                 if (enemy_x, enemy_y) not in used_positions:
                     used_positions.add((enemy_x, enemy_y))
-                    assigned_positions.append((enemy_x, enemy_y))
                     break  # Exit once a unique position is found
 
         # Assign enemies to the positions in this batch
         for position in used_positions:
             if remaining_enemies:
                 enemy_type = remaining_enemies.pop(0)  # Remove the first enemy in the list
-                enemy_class = ENEMY_CLASSES[enemy_type][0]
-                enemy_objects.append(enemy_class(position[0], position[1], enemy_type))
+                enemy_spawns.append((enemy_type, position[0], position[1]))
                 maze = add_zone(rows, cols, maze, position[0], position[1])  # Add safe zone
 
-    tile_map = generate_tiles(maze)
+    # Eligible powerup cells for the finished floor, shared by every spawn on it
+    placement = PlacementIndex(maze, center_x, center_y)
+
+    # Static maze layer, skipped when running headless
+    tile_map, maze_surface = None, None
+    if render:
+        tile_map = generate_tiles(maze)
+        maze_surface = bake_maze_surface(maze, tile_map)  # Re-baked only where doors change
+
+    return FloorPlan(floor, rows, cols, maze, door_positions, keys, enemy_spawns, placement, tile_map, maze_surface)
+
+class FloorPlanner:
+    # Plans the next floor on a worker thread while the current one is being played
+    def __init__(self, render=True, background=True):
+        self.render = render
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="floor-planner") if background else None
+        self.pending = None  # (floor, seed, future or None)
+
+    def prepare(self, floor, seed):
+        future = self.executor.submit(plan_floor, floor, seed, self.render) if self.executor else None
+        self.pending = (floor, seed, future)
+
+    def take(self, floor):
+        # The prepared plan for this floor, waiting for the worker if it is still busy
+        if self.pending is None or self.pending[0] != floor:
+            return None
+        _, seed, future = self.pending
+        self.pending = None
+        return future.result() if future else plan_floor(floor, seed, self.render)
+
+    def close(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+def start_mechanics(existing_player=None, render=True, plan=None):
+    AudioSystem.stop_all_sfx()
+    floor = existing_player.floor if existing_player else 1
+    if plan is None:
+        plan = plan_floor(floor, RNG.getrandbits(64), render)
+    rows, cols = plan.rows, plan.cols
+    
+    # Player spawns in the center of the player safe zone
+    if existing_player:
+        player = existing_player
+        player.x, player.y = rows // 2, cols // 2  # Reset player position
+        player.float_x, player.float_y = player.x, player.y
+        player.store_previous_position()
+        player.safe_zone_pos = (player.x, player.y)
+        player.target_pos = (player.x, player.y)
+        player.current_tile = ''
+    else:
+        # Player spawns in the center of the player safe zone
+        player = Player(rows // 2, cols // 2, INIT_SPEED_PLAYER)
+
+    # Instantiate each enemy at its planned position
+    enemy_objects = [ENEMY_CLASSES[enemy_type][0](x, y, enemy_type) for enemy_type, x, y in plan.enemy_spawns]
+
     camera = Camera(WIDTH, HEIGHT, rows, cols)
+    navigation = Navigation(plan.maze)  # Shared pathfinding toward the player for this floor
 
-    return player, enemy_objects, maze, tile_map, door_positions, keys, camera
+    return player, enemy_objects, plan.maze, plan.tile_map, plan.maze_surface, plan.door_positions, plan.keys, camera, navigation, plan.placement
 
-def get_enemies(player):
+def get_enemies(floor, rng=RNG):
     # Filter eligible enemies based on the player's floor
     available_enemies = [
         (enemy_type, data[2])  # (Enemy name, weight)
         for enemy_type, data in ENEMY_CLASSES.items()
-        if player.floor >= data[1]
+        if floor >= data[1]
     ]
 
     # Separate guaranteed enemies (weight = -1) from weighted selection
@@ -91,7 +157,7 @@ def get_enemies(player):
 
     # Calculate the maximum number of enemies to select
     max_enemies = min(
-        (INIT_MAX_ENEMIES + (math.floor((player.floor - 1) * (1 / MAX_FLOOR_TO_INCREASE_MAX_ENEMIES)))),
+        (INIT_MAX_ENEMIES + (math.floor((floor - 1) * (1 / MAX_FLOOR_TO_INCREASE_MAX_ENEMIES)))),
         len(available_enemies)
     )
 
@@ -101,7 +167,7 @@ def get_enemies(player):
     # Fill remaining slots with weighted random unique enemies
     while len(selected_enemy_types) < max_enemies:
         # Randomly select an enemy using weighted probability
-        chosen_enemy = random.choices(
+        chosen_enemy = rng.choices(
             [enemy for enemy, _ in normalized_weights],
             weights=[weight for _, weight in normalized_weights],
             k=1
@@ -116,133 +182,251 @@ def get_enemies(player):
     enemies.extend(selected_enemy_types)
     return enemies
 
+class GameState:
+    def __init__(self, render=True, seed=None, prefetch=True):
+        # The same seed and the same actions every step replay the same run
+        self.seed = seed if seed is not None else random.getrandbits(32)
+        RNG.seed(self.seed)
+
+        self.render = render
+        self.active_powerups = []
+        self.powerup_cooldown = 0
+        self.time = 0.0  # Game time in seconds, only advanced by update
+        self.planner = FloorPlanner(render, prefetch)  # Next floor is laid out while this one is played
+
+        # Every timed effect runs on game time, 'floor' events are dropped when a new floor starts
+        self.scheduler = Scheduler()
+        self.scheduler.schedule_repeating(INIT_POWERUP_SPAWN_COOLDOWN, self.spawn_powerup, scope='run')
+        self.start_floor()  # Start summoning player and enemies
+
+    def start_floor(self, existing_player=None):
+        self.scheduler.cancel_scope('floor')
+        floor = existing_player.floor if existing_player else 1
+        (self.player, enemy_objects, self.maze, self.tile_map, self.maze_surface,
+         self.door_positions, self.keys, self.camera, self.navigation, self.placement) = start_mechanics(existing_player, self.render, self.planner.take(floor))
+
+        # The next floor's seed is drawn now either way, so runs replay the same with or without prefetching
+        self.planner.prepare(floor + 1, RNG.getrandbits(64))
+
+        # Tile-keyed lookups for pickups still on the floor, kept in step as things are collected
+        self.key_index = TileIndex(self.keys)
+        self.powerup_index = TileIndex(powerup for powerup in self.active_powerups if not powerup.collected)
+        self.enemy_objects = []
+        self.set_enemies(enemy_objects)
+
+    def set_enemies(self, enemy_objects):
+        # Replace the floor's enemies, everything tracking them starts over with the new list
+        for enemy in self.enemy_objects:
+            AudioSystem.stop_source_sfx(enemy)
+        self.enemy_objects = enemy_objects
+        self.enemy_index = TileIndex(enemy_objects)
+
+        # Headless runs search without a time budget so the same seed always plays out the same
+        self.ai_scheduler = AIScheduler(AI_BUDGET_MS if self.render else None)
+
+    def close(self):
+        self.planner.close()
+
+    def start_frame(self):
+        # Called once per rendered frame, before its fixed steps
+        self.ai_scheduler.start_frame()
+
+    def spawn_powerup(self):
+        if len(self.active_powerups) < MAX_POWERUPS:
+            new_powerup = generate_powerups(self.maze, self.player.safe_zone_pos[0], self.player.safe_zone_pos[1], self.active_powerups, POWERUP_CLASSES, self.placement)
+            if new_powerup is not None:
+                self.active_powerups.append(new_powerup)
+                self.powerup_index.add(new_powerup, new_powerup.x, new_powerup.y)
+
+    def update(self, actions, delta_time):
+        # Advance the simulation by one step, returns True once the game is over
+        self.time += delta_time
+        self.scheduler.update(delta_time)
+        player = self.player
+
+        # Remember where everything was so rendering can interpolate into this step
+        player.store_previous_position()
+        for enemy in self.enemy_objects:
+            enemy.store_previous_position()
+
+        # Check if player is on 'P' tile to trigger level up after 1 second
+        if player.current_tile == 'P':
+            AudioSystem.play_sfx("portal_teleporting")
+            if player.floor_up_start_time is None:
+                player.floor_up_start_time = self.time
+            elif self.time - player.floor_up_start_time >= 1:
+                player.floor_up()
+                self.active_powerups = [item for item in self.active_powerups if item == player.current_powerup]
+                self.start_floor(player)
+        else:
+            player.floor_up_start_time = None
+
+        # Movement actions for the player
+        for action, (dx, dy) in MOVEMENT_ACTIONS.items():
+            if action in actions:
+                player.request_direction(dx, dy, self.maze)
+
+        # Activate powerup if cooldown is over
+        if 'powerup' in actions and player.has_powerup and self.powerup_cooldown <= 0:
+            self.active_powerups.remove(player.current_powerup)
+            player.activate_powerup(self.enemy_objects, self.scheduler)
+            self.powerup_cooldown = INIT_POWERUP_ACTIVATE_COOLDOWN
+
+        # Check door
+        if 'door' in actions:
+            check_door_unlock(player, self.door_positions, self.maze, self.scheduler)
+
+        # Update cooldown for powerup activation
+        if self.powerup_cooldown > 0:
+            self.powerup_cooldown -= delta_time
+
+        # Update player movement
+        player.move(delta_time, self.key_index, self.powerup_index, self.maze)
+        player.update_timer(delta_time)
+
+        METRICS.mark("simulation")
+
+        # Update enemy movement
+        self.navigation.set_goal((player.x, player.y))
+        visible_range = self.camera.get_visible_tile_range(margin=2) if self.render else None
+        self.ai_scheduler.update(self.enemy_objects, player, delta_time, lambda enemy: self.move_enemy(enemy, delta_time), visible_range)
+        METRICS.mark("enemies")
+
+        # Check for collision with enemies near the player or remaining time
+        nearby_enemies = self.enemy_index.around(round(player.float_x), round(player.float_y))
+        return check_collision(player, nearby_enemies) or player.timer <= 0
+
+    def move_enemy(self, enemy, delta_time):
+        enemy.move(self.player, self.maze, delta_time, self.navigation)
+        self.enemy_index.move(enemy, round(enemy.float_x), round(enemy.float_y))
+
+def get_player_actions(key_binds):
+    # Map the keyboard state to simulation actions
+    actions = set()
+    if key_binds[pygame.K_w] or key_binds[pygame.K_UP]:
+        actions.add('up')
+    if key_binds[pygame.K_s] or key_binds[pygame.K_DOWN]:
+        actions.add('down')
+    if key_binds[pygame.K_a] or key_binds[pygame.K_LEFT]:
+        actions.add('left')
+    if key_binds[pygame.K_d] or key_binds[pygame.K_RIGHT]:
+        actions.add('right')
+    if key_binds[pygame.K_e] or key_binds[pygame.K_COMMA]:
+        actions.add('powerup')  # Activate powerup on pressing E or , key
+    if key_binds[pygame.K_r] or key_binds[pygame.K_PERIOD]:
+        actions.add('door')  # Check door on pressing R or . key
+    return actions
+
 def game_loop():
-    player, enemy_objects, maze, tile_map, door_positions, keys, camera = start_mechanics()   # Start summoning player and enemies
-    active_powerups = []
-    powerup_cooldown = 0
+    hud = HUD()  # Static HUD art and fonts are built once per run
+    state = GameState()
     game_over = False
-    game_over_start_time = None
+    game_over_elapsed = 0
+    accumulator = 0  # Frame time not yet consumed by fixed simulation steps
 
     clock = pygame.time.Clock()
-    pygame.time.set_timer(POWERUP_SPAWN_EVENT, INIT_POWERUP_SPAWN_COOLDOWN * 1000)
     AudioSystem.play_music("haunted_pumpkin", True)
 
     running = True
     while running:
-        delta_time = clock.tick(FPS) / 1000.0  # Convert to seconds
+        frame_time = min(clock.tick(FPS) / 1000.0, MAX_FRAME_TIME)  # Convert to seconds
+        METRICS.start_frame()
+        floor, maze, enemy_objects = state.player.floor, state.maze, state.enemy_objects  # Floor this frame started on
 
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 running = False
-            elif event.type == DOOR_LOCK_EVENT:
-                toggle_door(maze, door_positions, 'locked')
-                player.maze_interaction_triggered = True
-                pygame.time.set_timer(DOOR_LOCK_EVENT, 0)
-            elif event.type == POWERUP_SPAWN_EVENT:
-                if len(active_powerups) < MAX_POWERUPS:
-                    new_powerup = generate_powerups(maze, player.safe_zone_pos[0], player.safe_zone_pos[1], active_powerups, POWERUP_CLASSES)
-                    active_powerups.append(new_powerup)
+                end_floor_metrics(floor, maze, enemy_objects)
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+                METRICS.toggle_overlay()
         
         # If game over, wait for 2 seconds and show game over screen
         if game_over:
             AudioSystem.stop_all_sfx()
-            if time.time() - game_over_start_time > 2:
-                if game_over_screen():
-                    return  # Return to title screen
-                game_over = False
+            game_over_elapsed += frame_time
+            if game_over_elapsed > 2:
+                state.close()  # game_over_screen goes on into a new title screen and session, stop this run's planner first
+                game_over_screen()
+                return  # Return to title screen
             continue
 
-        # Check if player is on 'P' tile to trigger level up after 2 seconds
-        if player.current_tile == 'P':
-            AudioSystem.play_sfx("portal_teleporting")
-            if player.floor_up_start_time is None:
-                player.floor_up_start_time = time.time()
-            elif time.time() - player.floor_up_start_time >= 1:
-                player.floor_up()
-                active_powerups = [item for item in  active_powerups if item == player.current_powerup]
-                player, enemy_objects, maze, tile_map, door_positions, keys, camera = start_mechanics(player)
-        else:
-            player.floor_up_start_time = None
-
-        # Key binds for the player
-        key_binds = pygame.key.get_pressed()
-        if key_binds[pygame.K_w] or key_binds[pygame.K_UP]:
-            player.request_direction(0, -1, maze)
-        if key_binds[pygame.K_s] or key_binds[pygame.K_DOWN]:
-            player.request_direction(0, 1, maze)
-        if key_binds[pygame.K_a] or key_binds[pygame.K_LEFT]:
-            player.request_direction(-1, 0, maze)
-        if key_binds[pygame.K_d] or key_binds[pygame.K_RIGHT]:
-            player.request_direction(1, 0, maze)
-
-        # Activate powerup on pressing E or , key if cooldown is over
-        if (key_binds[pygame.K_e] or key_binds[pygame.K_COMMA])and player.has_powerup and powerup_cooldown <= 0:
-            active_powerups.remove(player.current_powerup)
-            player.activate_powerup(enemy_objects)
-            powerup_cooldown = INIT_POWERUP_ACTIVATE_COOLDOWN 
-        
-        # Check door on pressing R or . key
-        if key_binds[pygame.K_r] or key_binds[pygame.K_PERIOD]:
-            check_door_unlock(player, door_positions, maze)
-
-        # Update cooldown for powerup activation
-        if powerup_cooldown > 0:
-            powerup_cooldown -= delta_time
-
-        # Update player movement
-        player.move(delta_time, keys, active_powerups, maze)
-        player.update_timer(delta_time)
-
-        # Update enemy movement
-        for enemy in enemy_objects:
-            enemy.move(player, maze, delta_time)
-
-        # Check for collision with enemies or remaining time
-        if check_collision(player, enemy_objects) or player.timer <= 0:
-            game_over = True
-            game_over_start_time = time.time()
+        # Run the simulation in fixed steps, whatever the frame rate
+        actions = get_player_actions(pygame.key.get_pressed())
+        METRICS.mark("input")
+        state.start_frame()
+        accumulator += frame_time
+        while accumulator >= FIXED_DT and not game_over:
+            accumulator -= FIXED_DT
+            game_over = state.update(actions, FIXED_DT)
+        if game_over:
+            game_over_elapsed = 0
+            end_floor_metrics(floor, maze, enemy_objects)
             continue
-
-        # Check if the maze was modified
-        if player.maze_interaction_triggered:
-            tile_map = generate_tiles(maze)
-            player.maze_interaction_triggered = False
-
-        # Get current powerup type if available
-        powerup_type = None 
-        powerup_name = None
-        if player.current_powerup is not None:
-            powerup_type = player.current_powerup.type
-            powerup_name = player.current_powerup.name
-
-        camera.follow((player.x, player.y), delta_time)
-        WIN.fill(PATH_COLOR)
-
-        draw_maze(maze, camera, tile_map)
-        for key in keys:
-            if not key.collected:
-                key.draw(WIN, camera)
-        for powerup in active_powerups:
-            if not powerup.collected:
-                powerup.draw(WIN, camera)
-        player.draw(WIN, camera, (128 if player.is_immune else 255))
-        for enemy in enemy_objects:
-            enemy.draw(WIN, camera, ENEMIES[enemy.enemy_type]["offset_y"])
-
-        display_player_stats(player.floor, player.timer)
-        display_inventory(player.has_key, powerup_type, powerup_name, powerup_cooldown)
-        display_movement_keybinds()
+        alpha = accumulator / FIXED_DT  # How far the frame is between the last step and the next
+        if state.player.floor != floor:
+            end_floor_metrics(floor, maze, enemy_objects)
+
+        state.camera.follow((state.player.x, state.player.y), frame_time)
+        with SURFACE_LOCK:  # The floor planner may be baking from the same sprites
+            draw_game(state, hud, alpha)
+            METRICS.draw_overlay(WIN)
+        METRICS.mark("overlay")
         pygame.display.update()
+        METRICS.mark("display")
+        AudioSystem.update(frame_time, (state.player.x, state.player.y))
+        METRICS.mark("audio")
+        METRICS.end_frame()
 
+    state.close()
     pygame.quit()
 
+def draw_game(state, hud, alpha=1.0):
+    # Draw one frame of the world and HUD, alpha interpolates entities between simulation steps
+    player, camera = state.player, state.camera
+
+    # Check if the maze was modified, only the door tiles and their neighbours need new sprites
+    if player.maze_interaction_triggered:
+        refreshed_tiles = update_tiles(state.tile_map, state.maze, state.door_positions)
+        update_maze_surface(state.maze_surface, state.tile_map, refreshed_tiles)
+        player.maze_interaction_triggered = False
+    METRICS.mark("tiles")
+
+    # Get current powerup type if available
+    powerup_type = None 
+    powerup_name = None
+    if player.current_powerup is not None:
+        powerup_type = player.current_powerup.type
+        powerup_name = player.current_powerup.name
+
+    WIN.fill(PATH_COLOR)
+
+    # Draw world layers, submitting only what is inside the viewport
+    draw_maze(state.maze_surface, camera, state.tile_map)
+    METRICS.mark("maze")
+    visible_tiles = camera.get_visible_tile_range(margin=1)
+    draw_world_layer([key.get_blit(camera) for key in state.key_index.in_range(*visible_tiles)])
+    draw_world_layer([powerup.get_blit(camera) for powerup in state.powerup_index.in_range(*visible_tiles)])
+    draw_world_layer([player.get_blit(camera, (128 if player.is_immune else 255), alpha)])
+    draw_world_layer([
+        enemy.get_blit(camera, ENEMIES[enemy.enemy_type]["offset_y"], alpha)
+        for enemy in sorted(state.enemy_index.in_range(*visible_tiles), key=lambda enemy: (enemy.float_y, enemy.float_x))  # Lower enemies drawn on top
+    ])
+    METRICS.mark("entities")
+
+    hud.draw(WIN, player.floor, player.timer, player.has_key, powerup_type, powerup_name, state.powerup_cooldown)
+    METRICS.mark("hud")
+
+def end_floor_metrics(floor, maze, enemy_objects):
+    # Export the finished floor's frame timings with the floor's size and enemy count
+    METRICS.end_floor(floor, maze.rows, maze.cols, len(enemy_objects))
+
 def check_collision(player, enemies):
     # Check if any enemy has collided with the player
     buffer = 8
-    player_rect = player.rect.inflate(-buffer, -buffer)
+    reach = TILE_SIZE - buffer  # Both boxes shrink by the buffer, so they overlap when closer than this on both axes
+    if player.is_immune:
+        return False
     for enemy in enemies:
-        # Create a smaller collision box for each enemy
-        enemy_rect = enemy.rect.inflate(-buffer, -buffer)
-        if player_rect.colliderect(enemy_rect) and not player.is_immune:
+        if abs(player.rect.x - enemy.rect.x) < reach and abs(player.rect.y - enemy.rect.y) < reach:
             return True
     return False
\ No newline at end of file
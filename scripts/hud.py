@@ -0,0 +1,183 @@
+# hud.py
+
+import pygame
+from settings import *
+
+class TextCache:
+    def __init__(self, font, color, max_entries=256):
+        self.font = font
+        self.color = color
+        self.max_entries = max_entries
+        self.surfaces = {}
+
+    def get(self, text):
+        # Rendered text surfaces keyed by their value
+        surface = self.surfaces.get(text)
+        if surface is None:
+            if len(self.surfaces) >= self.max_entries:
+                self.surfaces.clear()
+            surface = self.font.render(text, True, self.color)
+            self.surfaces[text] = surface
+        return surface
+
+class Widget:
+    def __init__(self, position, size):
+        self.position = position
+        self.base = pygame.Surface(size, pygame.SRCALPHA)  # Static art, drawn once
+        self.surface = self.base
+        self.inputs = None
+
+    def draw(self, win, *inputs):
+        # Re-render the widget only when its displayed values changed
+        if inputs != self.inputs:
+            self.inputs = inputs
+            self.surface = self.base.copy()
+            self.render(*inputs)
+        win.blit(self.surface, self.position)
+
+    def render(self, *inputs):
+        pass
+
+class StatWidget(Widget):
+    def __init__(self, position, label, icon_image, label_font, value_text):
+        holder_size = (180, 45)  # Size of the stats holder background
+        icon_size = (32, 32)  # Size of the floor and clock icons
+        super().__init__(position, (holder_size[0], holder_size[1] + 12))
+        self.value_text = value_text
+
+        stats_holder_image = SURFACE_CACHE.get_scaled_image(UI_ICON_SPRITES["stats_holder"], holder_size)
+        icon_image = SURFACE_CACHE.get(icon_image, "scale", icon_size)
+
+        # Positioning for the icon and texts inside the box
+        icon_padding = 16
+        self.text_padding = icon_padding + icon_size[0] + 10  # Space for the icon and padding
+        self.base.blit(stats_holder_image, (0, 0))
+        self.base.blit(icon_image, (icon_padding, (holder_size[1] - icon_size[1]) // 2))
+        self.base.blit(label_font.render(label, True, WHITE), (self.text_padding, 8))
+
+    def render(self, value):
+        self.surface.blit(self.value_text.get(value), (self.text_padding, 16))
+
+class PowerupSlotWidget(Widget):
+    def __init__(self, position, holder_image, keypad_image, name_text, cooldown_text):
+        super().__init__(position, (160, 90))
+        self.name_text = name_text
+        self.cooldown_text = cooldown_text
+
+        # Holder with its keypad below, the powerup name goes above
+        self.holder_size = holder_image.get_width()
+        self.holder_pos = (60, 24)
+        self.base.blit(holder_image, self.holder_pos)
+        self.base.blit(keypad_image, (self.holder_pos[0] + (self.holder_size - keypad_image.get_width()) // 2, self.holder_pos[1] + self.holder_size + 2))
+
+        # Semi-transparent copy of the holder image for the cooldown overlay
+        self.overlay = holder_image.copy()
+        self.overlay.fill((0, 0, 0, 128), special_flags=pygame.BLEND_RGBA_MULT)
+
+    def get_icon(self, powerup_type):
+        # Scaled powerup icon and its shadow, shared through the surface cache
+        to_center = 10
+        powerup_image = SURFACE_CACHE.get(POWERUP_OBJECTS[powerup_type], "scale", (self.holder_size - to_center, self.holder_size - to_center))
+        return powerup_image, SURFACE_CACHE.get(powerup_image, "shadow")
+
+    def render(self, powerup_type, powerup_name, cooldown):
+        holder_x, holder_y = self.holder_pos
+        center = (holder_x + self.holder_size // 2, holder_y + self.holder_size // 2)
+
+        # Render powerup image and its name above the holder if `powerup_type` is provided
+        if powerup_type:
+            powerup_image, shadow = self.get_icon(powerup_type)
+            self.surface.blit(shadow, (holder_x + 6, holder_y + 6))
+            self.surface.blit(powerup_image, (holder_x + 4, holder_y + 4))
+            name_text = self.name_text.get(powerup_name.upper())
+            self.surface.blit(name_text, name_text.get_rect(center=(center[0], holder_y - 8)))
+
+        # Render cooldown overlay and text if the powerup is cooling down
+        if cooldown:
+            self.surface.blit(self.overlay, self.holder_pos)
+            cooldown_text = self.cooldown_text.get(cooldown)
+            self.surface.blit(cooldown_text, cooldown_text.get_rect(center=center))
+
+class KeySlotWidget(Widget):
+    def __init__(self, position, holder_image, keypad_image):
+        holder_size = holder_image.get_width()
+        super().__init__(position, (holder_size, holder_size + 2 + keypad_image.get_height()))
+
+        # Holder with its keypad below
+        self.base.blit(holder_image, (0, 0))
+        self.base.blit(keypad_image, ((holder_size - keypad_image.get_width()) // 2, holder_size + 2))
+
+        to_center = 10
+        self.key_image = SURFACE_CACHE.get(KEY_OBJECTS["real"], "scale", (holder_size - to_center, holder_size - to_center))
+        self.shadow = SURFACE_CACHE.get(self.key_image, "shadow")
+
+    def render(self, has_key):
+        # Render key image if `has_key` is True
+        if has_key:
+            self.surface.blit(self.shadow, (6, 6))
+            self.surface.blit(self.key_image, (4, 4))
+
+class MovementKeybindsWidget(Widget):
+    def __init__(self, position, keypad_size, title_font):
+        super().__init__(position, (120, 80))
+
+        # Position each keypad relative to the S keypad
+        keybind_padding = 4
+        keypad_s_x, keypad_s_y = 44, 50
+        keypad_positions = {
+            "keypad_s": (keypad_s_x, keypad_s_y),
+            "keypad_w": (keypad_s_x, keypad_s_y - keypad_size),
+            "keypad_a": (keypad_s_x - keypad_size - keybind_padding, keypad_s_y),
+            "keypad_d": (keypad_s_x + keypad_size + keybind_padding, keypad_s_y)
+        }
+        for name, keypad_pos in keypad_positions.items():
+            self.base.blit(SURFACE_CACHE.get(KEYPAD_OBJECTS[name][0], "scale", (keypad_size, keypad_size)), keypad_pos)
+
+        # Render the "MOVEMENT" text
+        movement_text = title_font.render("MOVEMENT", True, WHITE)
+        self.base.blit(movement_text, movement_text.get_rect(center=(keypad_s_x + keypad_size // 2, keypad_s_y - keypad_size - 10)))
+
+class HUD:
+    def __init__(self):
+        # Fonts are parsed once for the whole run
+        label_font = pygame.font.Font(FONTS["colonna"], 14)
+        value_font = pygame.font.Font(FONTS["colonna"], 24)
+        value_font.set_bold(True)
+        cooldown_font = pygame.font.Font(FONTS["colonna"], 18)
+        cooldown_font.set_bold(True)
+        name_font = pygame.font.Font(FONTS["colonna"], 15)
+        name_font.set_bold(True)
+        title_font = pygame.font.Font(FONTS["colonna"], 14)
+        title_font.set_bold(True)
+        value_text = TextCache(value_font, WHITE)
+
+        # Player stats at the top center
+        center_x = WIDTH // 2
+        top_margin = 10
+        self.floor_widget = StatWidget((center_x - 180 - 10, top_margin), "FLOOR", UI_ICON_OBJECTS["floor"][0], label_font, value_text)
+        self.timer_widget = StatWidget((center_x + 10, top_margin), "TIMER", UI_ICON_OBJECTS["clock"][0], label_font, value_text)
+
+        # Inventory holders at the bottom center
+        holder_size = 40
+        keypad_size = 24
+        box_padding = 8
+        holder_y = HEIGHT - holder_size - 40
+        holder_image = SURFACE_CACHE.get(UI_ICON_OBJECTS["inventory_holder"][0], "scale", (holder_size, holder_size))
+        keypad_e_image = SURFACE_CACHE.get(KEYPAD_OBJECTS["keypad_e"][0], "scale", (keypad_size, keypad_size))
+        keypad_r_image = SURFACE_CACHE.get(KEYPAD_OBJECTS["keypad_r"][0], "scale", (keypad_size, keypad_size))
+        self.powerup_widget = PowerupSlotWidget(
+            ((WIDTH // 2) - holder_size - box_padding - 60, holder_y - 24), holder_image, keypad_e_image,
+            TextCache(name_font, BLACK), TextCache(cooldown_font, BLACK)
+        )
+        self.key_widget = KeySlotWidget(((WIDTH // 2) + box_padding, holder_y), holder_image, keypad_r_image)
+
+        # Movement keybinds at the bottom left
+        self.keybinds_widget = MovementKeybindsWidget((0, HEIGHT - 90), keypad_size, title_font)
+
+    def draw(self, win, floor, timer, has_key, powerup_type=None, powerup_name="", powerup_cooldown=0):
+        # Inputs are rounded to what is displayed, so widgets only re-render on visible changes
+        self.floor_widget.draw(win, str(floor))
+        self.timer_widget.draw(win, f"{timer:.1f}s")
+        self.powerup_widget.draw(win, powerup_type, powerup_name, f"{powerup_cooldown:.1f}s" if powerup_cooldown > 0 else None)
+        self.key_widget.draw(win, has_key)
+        self.keybinds_widget.draw(win)
@@ -1,11 +1,12 @@
 # key.py
 
-import pygame, random, math
+import pygame
 from settings import *
 from maze import *
+from placement import PlacementIndex
 from audio_system import AudioSystem
 
-DOOR_LOCK_EVENT = pygame.USEREVENT + 1
+DOOR_RELOCK_DELAY = 2.5  # Seconds an incorrect door stays open
 
 class Key:
     def __init__(self, x, y, is_real):
@@ -16,84 +17,50 @@ class Key:
 
         self.rect = pygame.Rect(self.x * TILE_SIZE, self.y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
     
-    def draw(self, win, camera):
-        x, y = camera.apply_to_maze(self.x, self.y)
+    def get_blit(self, camera):
+        # Sprite and screen position for batched drawing
         key_sprite = KEY_OBJECTS['real'] if self.is_real else KEY_OBJECTS['fake']
-        win.blit(key_sprite, (x, y))
+        return key_sprite, camera.apply_to_maze(self.x, self.y)
 
-def generate_keys(maze, center_x, center_y):
-    min_distance_from_center = 12
+def generate_keys(maze, center_x, center_y, placement=None, rng=RNG):
     min_distance_from_key = 8
-    min_distance_from_structure = 12 
-    structure_tiles = {'S', 'P', 'DL', 'DU', 'DI'}
-    keys = []
-    real_key_added = False
+    if placement is None:
+        placement = PlacementIndex(maze, center_x, center_y)
 
-    while len(keys) < MAX_KEYS:
-        # Generate random coordinates within maze bounds
-        x, y = random.randint(1, len(maze[0]) - 2), random.randint(1, len(maze) - 2)
-        
-        # Calculate distance from maze center
-        distance_from_center = math.sqrt((x - center_x) ** 2 + (y - center_y) ** 2)
-        
-        # Ensure the tile is walkable and far enough from the maze center
-        if maze[y][x] == 'O' and distance_from_center >= min_distance_from_center:
-            
-            # Check if the new key is too close to any existing keys
-            too_close_to_key = False
-            for key in keys:
-                distance_from_key = math.sqrt((x - key.x) ** 2 + (y - key.y) ** 2)
-                if distance_from_key < min_distance_from_key:
-                    too_close_to_key = True
-                    break
+    # The first key is the real one
+    return [Key(x, y, index == 0) for index, (x, y) in enumerate(placement.pick(MAX_KEYS, min_distance_from_key, rng=rng))]
 
-            # Check if the new key is too close to any portal structure tile
-            too_close_to_structure = False
-            for i in range(max(0, y - min_distance_from_structure), 
-                           min(len(maze), y + min_distance_from_structure + 1)):
-                for j in range(max(0, x - min_distance_from_structure), 
-                               min(len(maze[0]), x + min_distance_from_structure + 1)):
-                    if maze[i][j] in structure_tiles:
-                        distance_from_structure = math.sqrt((x - j) ** 2 + (y - i) ** 2)
-                        if distance_from_structure < min_distance_from_structure:
-                            too_close_to_structure = True
-                            break
-                if too_close_to_structure:
-                    break
-            
-            # If the new key position is valid, add it to the list
-            if not too_close_to_key and not too_close_to_structure:
-                is_real = not real_key_added  # Set is_real for the first key only
-                keys.append(Key(x, y, is_real))
-                real_key_added = real_key_added or is_real
-
-    return keys
-
-def check_key_collection(player, keys):
-    # Check if the player can collect a key
-    for key in keys:
-        if not key.collected and player.x == key.x and player.y == key.y and player.has_key == False and player.can_collect:
+def check_key_collection(player, key_index):
+    # Check if the player can collect a key, only the keys on the player's tile are looked at
+    for key in key_index.at(player.x, player.y):
+        if not key.collected and player.has_key == False and player.can_collect:
             player.has_key = True
             player.key_is_real = key.is_real
             key.collected = True
+            key_index.remove(key)
             AudioSystem.play_sfx("key_collected")
+            break
 
-def check_door_unlock(player, door_positions, maze):
+def check_door_unlock(player, door_positions, maze, scheduler):
     # Check if the player is near a door and has a key
     if player.has_key:
-        pygame.time.set_timer(DOOR_LOCK_EVENT, 0)
+        scheduler.cancel("door_relock")
         # Iterate for every door tiles
         for door_y, door_x in door_positions:
-            if abs(player.x - door_x) + abs(player.y - door_y) == 1 and maze[door_y][door_x] is not 'DU':  # Near the door
+            if abs(player.x - door_x) + abs(player.y - door_y) == 1 and maze[door_y][door_x] != 'DU':  # Near the door
                 if player.key_is_real:
                     toggle_door(maze, door_positions, 'unlocked')
                     AudioSystem.play_sfx("real_key_used")
                 else:
                     toggle_door(maze, door_positions, 'incorrect')
                     AudioSystem.play_sfx("fake_key_used")
-                    pygame.time.set_timer(DOOR_LOCK_EVENT, 2500)
+                    scheduler.schedule(DOOR_RELOCK_DELAY, relock_doors, player, door_positions, maze, name="door_relock")
                     
                 # Remove the key regardless of its authenticity
                 player.has_key = False
                 player.key_is_real = False
-                player.maze_interaction_triggered = True
\ No newline at end of file
+                player.maze_interaction_triggered = True
+
+def relock_doors(player, door_positions, maze):
+    toggle_door(maze, door_positions, 'locked')
+    player.maze_interaction_triggered = True
@@ -1,8 +1,10 @@
 # main.py
 
 from interface import title_screen
+from audio_system import AudioSystem
 
 def main():
+    AudioSystem.preload()  # Decode sound effects before the first frame needs them
     title_screen()      # Show the title screen first
 
 if __name__ == "__main__":
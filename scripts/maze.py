@@ -1,102 +1,114 @@
 # maze.py
 
-import random, math
+import math
+import numpy as np
 from settings import *
 from utils import *
+from maze_grid import MazeGrid, WALL, PATH, BORDER
 
-def generate_maze(rows, cols):
-    # Initialize the maze with walls ('X')
-    maze = [['X' for _ in range(cols)] for _ in range(rows)]
-
-    # Ensure the border remains as walls
-    for i in range(rows):
-        maze[i][0] = 'B'
-        maze[i][cols - 1] = 'B'
-    for j in range(cols):
-        maze[0][j] = 'B'
-        maze[rows - 1][j] = 'B'
-
-    # Carve paths within the inner area only (1 to rows-2 and 1 to cols-2)
-    def carve_path(x, y):
-        directions = [(0, 2), (2, 0), (0, -2), (-2, 0)]
-        random.shuffle(directions)
-
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-
-            # Check if the next cell and the cell between the current and next cell are within bounds
-            if 1 <= nx < rows - 1 and 1 <= ny < cols - 1 and maze[nx][ny] == 'X':
-                maze[nx][ny] = 'O'  # Carve out path at target cell
-                maze[x + dx // 2][y + dy // 2] = 'O'  # Carve out path in between
-                carve_path(nx, ny)  # Recur for the next cell
-
-                # Add extra connections randomly to create multiple paths
-                if random.random() < 0.4:
-                    additional_connection(x, y, rows, cols, maze)
-
-    # Start carving from a central cell
-    start_x, start_y = 1, 1
-    maze[start_x][start_y] = 'O'
-    carve_path(start_x, start_y)
-    remove_dead_ends(rows, cols, maze)
-
-    door_positions = add_portal_structure(rows, cols, maze, PORTAL_STRUCTURE_SIZE)
+def generate_maze(rows, cols, rng=RNG):
+    # Initialize the maze with walls ('X') and keep the border as 'B' while carving
+    codes = np.full((rows, cols), WALL, dtype=np.uint8)
+    codes[[0, rows - 1], :] = BORDER
+    codes[:, [0, cols - 1]] = BORDER
+
+    # Carve paths within the inner area only (1 to rows-2 and 1 to cols-2), starting from a corner cell
+    cells = bytearray(codes.tobytes())
+    carve_paths(rows, cols, cells, 1, 1, rng)
+    maze = MazeGrid.from_codes(np.frombuffer(bytes(cells), dtype=np.uint8).reshape(rows, cols))
+    remove_dead_ends(rows, cols, maze, rng=rng)
+
+    door_positions = add_portal_structure(rows, cols, maze, PORTAL_STRUCTURE_SIZE, rng)
     ensure_border_closed(rows, cols, maze)
 
     return maze, door_positions
 
-def additional_connection(x, y, rows, cols, maze):
+def carve_paths(rows, cols, cells, start_x, start_y, rng=RNG):
+    # Depth-first carving on a flat cell buffer with an explicit stack, so large floors never hit the recursion limit
+    # Each frame is [x, y, shuffled directions, next direction index, returned from a child]
+    cells[start_x * cols + start_y] = PATH
+    stack = [[start_x, start_y, get_shuffled_directions(rng), 0, False]]
+
+    while stack:
+        frame = stack[-1]
+        x, y, directions = frame[0], frame[1], frame[2]
+
+        # Add extra connections randomly to create multiple paths once a branch is finished
+        if frame[4]:
+            frame[4] = False
+            if rng.random() < 0.4:
+                additional_connection(x, y, rows, cols, cells, rng)
+
+        if frame[3] == len(directions):
+            stack.pop()
+            continue
+
+        dx, dy = directions[frame[3]]
+        frame[3] += 1
+        nx, ny = x + dx, y + dy
+
+        # Check if the next cell and the cell between the current and next cell are within bounds
+        if 1 <= nx < rows - 1 and 1 <= ny < cols - 1 and cells[nx * cols + ny] == WALL:
+            cells[nx * cols + ny] = PATH  # Carve out path at target cell
+            cells[(x + dx // 2) * cols + (y + dy // 2)] = PATH  # Carve out path in between
+            frame[4] = True
+            stack.append([nx, ny, get_shuffled_directions(rng), 0, False])  # Continue from the next cell
+
+def get_shuffled_directions(rng=RNG):
+    directions = [(0, 2), (2, 0), (0, -2), (-2, 0)]
+    rng.shuffle(directions)
+    return directions
+
+def additional_connection(x, y, rows, cols, cells, rng=RNG):
     directions = [(0, 1), (1, 0), (0, -1), (-1, 0)]
-    random.shuffle(directions)
+    rng.shuffle(directions)
 
     for dx, dy in directions:
         nx, ny = x + dx, y + dy
-        if 1 <= nx < rows - 1 and 1 <= ny < cols - 1 and maze[nx][ny] == 'X':
-            maze[nx][ny] = 'O'
+        if 1 <= nx < rows - 1 and 1 <= ny < cols - 1 and cells[nx * cols + ny] == WALL:
+            cells[nx * cols + ny] = PATH
             break
 
-def remove_dead_ends(rows, cols, maze):
-    # Remove dead-ends by adding extra paths where needed
-    for i in range(1, rows - 1):
-        for j in range(1, cols - 1):
-            if maze[i][j] == 'O':
-                # Count the number of open paths around the current cell
-                exits = sum(1 for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]
-                            if maze[i + dx][j + dy] == 'O')
-                # If it has only one exit, add an additional connection
-                if exits == 1:
-                    for dx, dy in random.sample([(0, 1), (1, 0), (0, -1), (-1, 0)], 4):
-                        nx, ny = i + dx, j + dy
-                        if maze[nx][ny] == 'X':  # Make an opening to avoid dead-end
-                            maze[nx][ny] = 'O'
-                            maze[i + dx // 2][j + dy // 2] = 'O'
-                            break
+def remove_dead_ends(rows, cols, maze, max_passes=8, rng=RNG):
+    # Remove dead-ends by adding extra paths where needed, handling every dead-end of a pass at once
+    offsets = np.array([(0, 1), (1, 0), (0, -1), (-1, 0)])
+    generator = np.random.default_rng(rng.getrandbits(64))
+
+    for _ in range(max_passes):
+        # Count the number of open paths around every inner cell
+        is_path = maze.codes == PATH
+        exits = (is_path[:-2, 1:-1].astype(np.int8) + is_path[2:, 1:-1] + is_path[1:-1, :-2] + is_path[1:-1, 2:])
+        dead_end_x, dead_end_y = np.nonzero(is_path[1:-1, 1:-1] & (exits == 1))
+        if len(dead_end_x) == 0:
+            break
+
+        # Open one random wall next to each dead-end
+        neighbor_x = dead_end_x[:, None] + 1 + offsets[:, 0]
+        neighbor_y = dead_end_y[:, None] + 1 + offsets[:, 1]
+        candidates = maze.codes[neighbor_x, neighbor_y] == WALL
+        priority = np.where(candidates, generator.random(candidates.shape), -1.0)
+        choice = priority.argmax(axis=1)
+        opened = np.nonzero(candidates.any(axis=1))[0]
+        if len(opened) == 0:
+            break
+        maze.fill('O', neighbor_x[opened, choice[opened]], neighbor_y[opened, choice[opened]])
 
 def ensure_border_closed(rows, cols, maze):
-    # Further ensure no accidental border openings by checking the edges again
-    for i in range(rows):
-        maze[i][0] = 'X'
-        maze[i][cols - 1] = 'X'
-    for j in range(cols):
-        maze[0][j] = 'X'
-        maze[rows - 1][j] = 'X'
+    # Further ensure no accidental border openings by closing the edges again
+    maze.fill('X', [0, rows - 1], slice(None))
+    maze.fill('X', slice(None), [0, cols - 1])
 
 def add_zone(rows, cols, maze, enemy_x, enemy_y):
     # Zone for the player (center of the maze)
     center_x, center_y = rows // 2, cols // 2
-    for i in range(center_x - 1, center_x + 2):
-        for j in range(center_y - 1, center_y + 2):
-            maze[i][j] = 'O'
+    maze.fill('O', slice(center_x - 1, center_x + 2), slice(center_y - 1, center_y + 2))
 
     # Enemy zone in a corner
-    for i in range(enemy_x, enemy_x + 3):
-        for j in range(enemy_y, enemy_y + 3):
-            if 0 <= i < rows and 0 <= j < cols:
-                maze[j][i] = 'O'
+    maze.fill('O', slice(max(0, enemy_y), enemy_y + 3), slice(max(0, enemy_x), enemy_x + 3))
 
     return maze
 
-def add_portal_structure(rows, cols, maze, dimension):
+def add_portal_structure(rows, cols, maze, dimension, rng=RNG):
     # Calculate sizes based on the dimension
     wall_size = dimension + 2  # Wall boundary size
     path_size = dimension + 4  # Path boundary size
@@ -109,27 +121,16 @@ def add_portal_structure(rows, cols, maze, dimension):
         'right': (rows // 2 - math.ceil(wall_size / 2), cols - (wall_size + 1))
     }
     
-    selected_key = random.choice(list(structure_positions.keys()))
+    selected_key = rng.choice(list(structure_positions.keys()))
     position = structure_positions[selected_key]
     struct_x, struct_y = position
 
     # Create the path boundary
-    for i in range(struct_x, struct_x + path_size):
-        for j in range(struct_y, struct_y + path_size):
-            if 0 <= i < rows and 0 <= j < cols:
-                maze[i][j] = 'O'  # Initialize as path
-
-    # Create the wall boundary around the structure
-    for i in range(struct_x + 1, struct_x + (wall_size + 1)):
-        for j in range(struct_y + 1, struct_y + (wall_size + 1)):
-            if (i == struct_x + 1 or i == struct_x + wall_size or
-                j == struct_y + 1 or j == struct_y + wall_size):
-                maze[i][j] = 'X'  # Wall boundary
-
-    # Create the structure in the center
-    for i in range(struct_x + 2, struct_x + wall_size):
-        for j in range(struct_y + 2, struct_y + wall_size):
-            maze[i][j] = 'S'  # Structure floor
+    maze.fill('O', slice(max(0, struct_x), struct_x + path_size), slice(max(0, struct_y), struct_y + path_size))
+
+    # Create the wall boundary around the structure, then the structure floor in the center
+    maze.fill('X', slice(struct_x + 1, struct_x + wall_size + 1), slice(struct_y + 1, struct_y + wall_size + 1))
+    maze.fill('S', slice(struct_x + 2, struct_x + wall_size), slice(struct_y + 2, struct_y + wall_size))
 
     # Define door and portal positions based on the selected key
     door_positions = []
@@ -151,15 +152,13 @@ def add_portal_structure(rows, cols, maze, dimension):
     def create_structure(structure_type, position_info):
         row, col = position_info
         if isinstance(row, int):  # For top and bottom structures
-            for j in col:
-                maze[row][j] = structure_type
-                if structure_type == 'DL':
-                    door_positions.append((row, j))
+            maze.fill(structure_type, row, slice(col.start, col.stop))
+            positions = [(row, j) for j in col]
         else:  # For left and right structures
-            for i in row:
-                maze[i][col] = structure_type
-                if structure_type == 'DL':
-                    door_positions.append((i, col))
+            maze.fill(structure_type, slice(row.start, row.stop), col)
+            positions = [(i, col) for i in row]
+        if structure_type == 'DL':
+            door_positions.extend(positions)
 
     # Create door and portal using the combined function
     create_structure('DL', door_position_map[selected_key])  # Create door
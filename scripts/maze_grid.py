@@ -0,0 +1,134 @@
+# maze_grid.py
+
+import numpy as np
+
+# Named tile codes stored in the grid
+WALL = 0
+PATH = 1
+BORDER = 2
+STRUCTURE = 3
+PORTAL = 4
+DOOR_LOCKED = 5
+DOOR_UNLOCKED = 6
+DOOR_INCORRECT = 7
+
+TILE_CODES = {
+    'X': WALL,
+    'O': PATH,
+    'B': BORDER,
+    'S': STRUCTURE,
+    'P': PORTAL,
+    'DL': DOOR_LOCKED,
+    'DU': DOOR_UNLOCKED,
+    'DI': DOOR_INCORRECT
+}
+TILE_NAMES = {code: name for name, code in TILE_CODES.items()}
+
+STRUCTURE_TILES = {'S', 'P', 'DL', 'DU', 'DI'}
+
+# Tiles each movement mode can stand on
+WALKABLE_TILES = {
+    'player': {'O', 'B', 'S', 'P', 'DU'},
+    'enemy': {'O'},
+    'wall_immune': {'O', 'X', 'S', 'P', 'DL', 'DU', 'DI'}
+}
+
+def get_tile_lookup(tiles):
+    # Boolean table indexed by tile code, so a whole grid can be classified in one array lookup
+    lookup = np.zeros(len(TILE_CODES), dtype=bool)
+    for tile in tiles:
+        lookup[TILE_CODES[tile]] = True
+    return lookup
+
+WALKABLE_LOOKUPS = {mode: get_tile_lookup(tiles) for mode, tiles in WALKABLE_TILES.items()}
+
+class MazeRow:
+    # Compatibility view so existing maze[y][x] reads and writes keep working
+    __slots__ = ('grid', 'y')
+
+    def __init__(self, grid, y):
+        self.grid = grid
+        self.y = y
+
+    def __getitem__(self, x):
+        return TILE_NAMES[int(self.grid.codes[self.y, x])]
+
+    def __setitem__(self, x, tile):
+        self.grid.set_tile(x, self.y, tile)
+
+    def __len__(self):
+        return self.grid.cols
+
+    def __iter__(self):
+        return (TILE_NAMES[code] for code in self.grid.codes[self.y].tolist())
+
+class MazeGrid:
+    def __init__(self, rows, cols, tile='X'):
+        self.codes = np.full((rows, cols), TILE_CODES[tile], dtype=np.uint8)
+        self.version = 0  # Bumped on every write so cached data knows when to rebuild
+        self.masks = {}
+
+    @classmethod
+    def from_codes(cls, codes):
+        grid = cls.__new__(cls)
+        grid.codes = np.array(codes, dtype=np.uint8)
+        grid.version = 0
+        grid.masks = {}
+        return grid
+
+    @property
+    def rows(self):
+        return self.codes.shape[0]
+
+    @property
+    def cols(self):
+        return self.codes.shape[1]
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, y):
+        return MazeRow(self, y)
+
+    def __iter__(self):
+        return (MazeRow(self, y) for y in range(self.rows))
+
+    def in_bounds(self, x, y):
+        return 0 <= x < self.cols and 0 <= y < self.rows
+
+    def tile(self, x, y):
+        return TILE_NAMES[int(self.codes[y, x])]
+
+    def set_tile(self, x, y, tile):
+        self.codes[y, x] = TILE_CODES[tile]
+        self.version += 1
+
+    def fill(self, tile, rows=slice(None), cols=slice(None)):
+        # Write a whole region (slices or index arrays) in one array operation
+        self.codes[rows, cols] = TILE_CODES[tile]
+        self.version += 1
+
+    def tile_mask(self, tiles):
+        return get_tile_lookup(tiles)[self.codes]
+
+    def walkable_mask(self, mode):
+        # Precomputed per movement mode and reused until the grid changes
+        cached = self.masks.get(mode)
+        if cached is None or cached[0] != self.version:
+            cached = (self.version, WALKABLE_LOOKUPS[mode][self.codes])
+            self.masks[mode] = cached
+        return cached[1]
+
+    def walkable_list(self, mode):
+        # The same mask flattened row by row into a list, for searches that index it from pure Python
+        cached = self.masks.get((mode, 'list'))
+        if cached is None or cached[0] != self.version:
+            cached = (self.version, self.walkable_mask(mode).ravel().tolist())
+            self.masks[(mode, 'list')] = cached
+        return cached[1]
+
+    def is_walkable(self, x, y, mode):
+        return self.in_bounds(x, y) and bool(self.walkable_mask(mode)[y, x])
+
+    def to_list(self):
+        return [[TILE_NAMES[code] for code in row] for row in self.codes.tolist()]
@@ -0,0 +1,126 @@
+# metrics.py
+
+import pygame, time, csv, json
+from collections import deque
+from settings import *
+
+# Frame phases in the order they run
+PHASES = ["input", "simulation", "enemies", "tiles", "maze", "entities", "hud", "overlay", "display", "audio"]
+PERCENTILES = (50, 95, 99)
+
+def get_percentiles(values):
+    ordered = sorted(values)
+    return {percentile: ordered[min(len(ordered) - 1, len(ordered) * percentile // 100)] for percentile in PERCENTILES}
+
+class FrameMetrics:
+    def __init__(self, window=300, export_path=None):
+        self.export_path = export_path
+        self.show_overlay = False
+        self.enabled = export_path is not None  # Timing only runs while someone is looking at it
+        self.window = window
+
+        self.last_mark = 0
+        self.frame_totals = dict.fromkeys(PHASES, 0.0)
+        self.recent = {phase: deque(maxlen=window) for phase in PHASES + ["frame"]}
+        self.floor_samples = {phase: [] for phase in PHASES + ["frame"]}  # Every frame of the current floor, for export
+        self.floor_records = []
+
+        # Overlay text is re-rendered a few times a second, not every frame
+        self.font = None
+        self.overlay = None
+        self.overlay_refresh_time = 0
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        self.enabled = self.show_overlay or self.export_path is not None
+        self.overlay = None
+
+        # Toggled mid-frame after start_frame was skipped, so restart the frame here
+        self.frame_totals = dict.fromkeys(PHASES, 0.0)
+        self.last_mark = time.perf_counter()
+
+    def start_frame(self):
+        if not self.enabled:
+            return
+        self.frame_totals = dict.fromkeys(PHASES, 0.0)
+        self.last_mark = time.perf_counter()
+
+    def mark(self, phase):
+        # Charge the time since the previous mark to a phase, phases hit by several fixed steps add up
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.frame_totals[phase] += now - self.last_mark
+        self.last_mark = now
+
+    def end_frame(self):
+        if not self.enabled:
+            return
+        frame_total = 0.0
+        for phase, duration in self.frame_totals.items():
+            self.recent[phase].append(duration)
+            frame_total += duration
+        self.recent["frame"].append(frame_total)
+
+        if self.export_path is not None:
+            for phase, duration in self.frame_totals.items():
+                self.floor_samples[phase].append(duration)
+            self.floor_samples["frame"].append(frame_total)
+
+    def summarize(self, samples):
+        # Milliseconds per phase: mean and rolling percentiles
+        summary = {}
+        for phase, values in samples.items():
+            if values:
+                percentiles = get_percentiles(values)
+                summary[phase] = {"mean": sum(values) / len(values) * 1000, **{f"p{percentile}": value * 1000 for percentile, value in percentiles.items()}}
+        return summary
+
+    def end_floor(self, floor, rows, cols, enemy_count):
+        # Close the floor's samples into one record per phase and rewrite the export file
+        if self.export_path is None or not self.floor_samples["frame"]:
+            return
+        frames = len(self.floor_samples["frame"])
+        for phase, stats in self.summarize(self.floor_samples).items():
+            self.floor_records.append({
+                "floor": floor, "rows": rows, "cols": cols, "enemies": enemy_count, "frames": frames, "phase": phase,
+                **{name: round(value, 4) for name, value in stats.items()}
+            })
+        self.floor_samples = {phase: [] for phase in self.floor_samples}
+        self.export()
+
+    def export(self):
+        if self.export_path.endswith(".json"):
+            with open(self.export_path, "w") as export_file:
+                json.dump(self.floor_records, export_file, indent=2)
+        else:
+            with open(self.export_path, "w", newline="") as export_file:
+                writer = csv.DictWriter(export_file, fieldnames=list(self.floor_records[0]))
+                writer.writeheader()
+                writer.writerows(self.floor_records)
+
+    def draw_overlay(self, win, color=(255, 255, 255)):
+        if not self.show_overlay:
+            return
+        now = time.perf_counter()
+        if self.overlay is None or now - self.overlay_refresh_time > 0.5:
+            self.overlay_refresh_time = now
+            if self.font is None:
+                self.font = pygame.font.SysFont("monospace", 12)
+
+            lines = [f"{'phase':<11}{'p50':>7}{'p95':>7}{'p99':>7}  ms"]
+            for phase, stats in self.summarize(self.recent).items():
+                lines.append(f"{phase:<11}{stats['p50']:>7.2f}{stats['p95']:>7.2f}{stats['p99']:>7.2f}")
+            assets = ASSETS.report().values()
+            lines.append(f"assets {len(assets):>6} {sum(group['bytes'] for group in assets) / 1048576:>5.1f}MB {sum(group['load_ms'] for group in assets):>5.0f}ms {ASSETS.atlas_page_count()}pg")
+            cache = SURFACE_CACHE.get_stats()
+            lines.append(f"surfaces {cache['entries']:>4} {cache['bytes'] / 1048576:>5.1f}MB {cache['hits'] / max(1, cache['hits'] + cache['misses']):>4.0%} hit")
+
+            line_height = self.font.get_linesize()
+            self.overlay = pygame.Surface((220, line_height * len(lines) + 8), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 160))
+            for index, line in enumerate(lines):
+                self.overlay.blit(self.font.render(line, True, color), (6, 4 + index * line_height))
+        win.blit(self.overlay, (8, 8))
+
+METRICS = FrameMetrics(METRICS_WINDOW, METRICS_EXPORT_PATH)
@@ -0,0 +1,191 @@
+# navigation.py
+
+import time
+import numpy as np
+from collections import deque
+from settings import RNG
+from maze_grid import PATH
+
+class FlowField:
+    def __init__(self, is_immune_to_wall):
+        self.is_immune_to_wall = is_immune_to_wall
+        self.state = None  # (goal, maze version) the distances were built for
+        self.distances = []
+        self.previous_distances = []  # Whatever the last search settled, for enemies that may not search this step
+        self.frontier = deque()
+        self.walkable = []
+        self.rows, self.cols = 0, 0
+
+    def rebuild(self, goal, maze, state):
+        # Restart the breadth-first search outward from the goal, it only expands as far as callers ask
+        self.rows, self.cols = maze.rows, maze.cols
+        self.previous_distances = self.distances
+        self.distances = [-1] * (self.rows * self.cols)
+        self.frontier = deque()
+        self.state = state
+
+        self.walkable = maze.walkable_list('wall_immune' if self.is_immune_to_wall else 'enemy')
+        goal_x, goal_y = goal
+        if not (0 <= goal_x < self.cols and 0 <= goal_y < self.rows) or not self.walkable[goal_y * self.cols + goal_x]:
+            return  # Goal cannot be reached, leave every tile unreachable
+
+        self.distances[goal_y * self.cols + goal_x] = 0
+        self.frontier.append(goal_y * self.cols + goal_x)
+
+    def is_settled(self, x, y):
+        # Known distance, or the search already ran out of tiles
+        return not self.frontier or self.distance(x, y) != -1
+
+    def expand_until(self, x, y, deadline=None):
+        # Continue the search until the tile has its distance, the search is exhausted or the deadline passes
+        distances, walkable, frontier, cols = self.distances, self.walkable, self.frontier, self.cols
+        size = len(distances)
+        index = y * cols + x
+        expanded = 0
+        while frontier and distances[index] == -1:
+            current = frontier.popleft()
+            next_distance = distances[current] + 1
+            current_x = current % cols
+            for neighbor in (current + 1 if current_x + 1 < cols else -1, current - 1 if current_x > 0 else -1, current + cols, current - cols):
+                if 0 <= neighbor < size and distances[neighbor] == -1 and walkable[neighbor]:
+                    distances[neighbor] = next_distance
+                    frontier.append(neighbor)
+            expanded += 1
+            if deadline is not None and expanded % 256 == 0 and time.perf_counter() >= deadline:
+                break
+        return distances[index] != -1 or not frontier
+
+    def distance(self, x, y, distances=None):
+        distances = self.distances if distances is None else distances
+        if 0 <= x < self.cols and 0 <= y < self.rows and distances:
+            return distances[y * self.cols + x]
+        return -1
+
+    def next_step(self, start, distances=None):
+        # Pick the neighbouring tile that is closest to the goal
+        x, y = start
+        if self.distance(x, y, distances) == 0:
+            return None  # Already standing on the goal
+
+        best_step, best_distance = None, -1
+        for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            distance = self.distance(nx, ny, distances)
+            if distance != -1 and (best_distance == -1 or distance < best_distance):
+                best_step, best_distance = (nx, ny), distance
+        return best_step
+
+class WalkableCells:
+    def __init__(self, maze, bucket_size=8):
+        # Open path cells grouped into square buckets, so a query only looks at the buckets its circle touches
+        self.bucket_size = bucket_size
+        self.bucket_cols = -(-maze.cols // bucket_size)
+        bucket_rows = -(-maze.rows // bucket_size)
+
+        ys, xs = np.nonzero(maze.codes == PATH)
+        buckets = (ys // bucket_size) * self.bucket_cols + xs // bucket_size
+        order = np.argsort(buckets, kind='stable')
+        self.xs, self.ys = xs[order], ys[order]
+        self.count = len(order)
+        self.bucket_starts = np.searchsorted(buckets[order], np.arange(bucket_rows * self.bucket_cols + 1)).tolist()
+        self.bucket_rows = bucket_rows
+
+    def get_spans(self, x, y, radius):
+        # Index ranges of the non-empty buckets overlapping the square around the circle
+        size = self.bucket_size
+        first_col, last_col = max(0, (x - radius) // size), min(self.bucket_cols - 1, (x + radius) // size)
+        first_row, last_row = max(0, (y - radius) // size), min(self.bucket_rows - 1, (y + radius) // size)
+        spans = []
+        for bucket_row in range(int(first_row), int(last_row) + 1):
+            for bucket_col in range(int(first_col), int(last_col) + 1):
+                bucket = bucket_row * self.bucket_cols + bucket_col
+                start, end = self.bucket_starts[bucket], self.bucket_starts[bucket + 1]
+                if start < end:
+                    spans.append((start, end))
+        return spans
+
+    def pick_matching(self, indices, matches, rng):
+        matching = indices[matches]
+        if len(matching) == 0:
+            return None
+        return self.get_cell(int(matching[rng.randrange(len(matching))]))
+
+    def get_cell(self, index):
+        return int(self.xs[index]), int(self.ys[index])
+
+    def sample_within(self, x, y, radius, rng=RNG, tries=16):
+        # Random open cell closer than radius to (x, y), or None when there is none
+        spans = self.get_spans(x, y, radius)
+        total = sum(end - start for start, end in spans)
+        if total == 0:
+            return None
+        limit = radius * radius
+        for _ in range(tries):
+            offset = rng.randrange(total)
+            for start, end in spans:
+                if offset < end - start:
+                    break
+                offset -= end - start
+            cell_x, cell_y = self.get_cell(start + offset)
+            if (cell_x - x) ** 2 + (cell_y - y) ** 2 < limit:
+                return cell_x, cell_y
+
+        # Mostly walls around here, check every candidate once instead
+        indices = np.concatenate([np.arange(start, end) for start, end in spans])
+        return self.pick_matching(indices, (self.xs[indices] - x) ** 2 + (self.ys[indices] - y) ** 2 < limit, rng)
+
+    def sample_outside(self, x, y, radius, rng=RNG, tries=16):
+        # Random open cell farther than radius from (x, y), or None when there is none
+        if self.count == 0:
+            return None
+        limit = radius * radius
+        for _ in range(tries):
+            cell_x, cell_y = self.get_cell(rng.randrange(self.count))
+            if (cell_x - x) ** 2 + (cell_y - y) ** 2 > limit:
+                return cell_x, cell_y
+
+        indices = np.arange(self.count)
+        return self.pick_matching(indices, (self.xs - x) ** 2 + (self.ys - y) ** 2 > limit, rng)
+
+class Navigation:
+    def __init__(self, maze):
+        self.maze = maze
+        self.goal = None
+        self.walkable_cells = WalkableCells(maze)  # Wander targets for this floor, doors never turn into open path
+
+        # Separate fields for normal movement and wall-immune movement
+        self.flow_fields = {
+            False: FlowField(False),
+            True: FlowField(True)
+        }
+
+    def set_goal(self, goal):
+        # Shared goal for every chasing enemy, normally the player's tile
+        self.goal = goal
+
+    def has_field_for(self, target):
+        return self.goal is not None and target == self.goal
+
+    def get_flow_field(self, is_immune_to_wall):
+        # Rebuild lazily, only when the goal tile or the maze (door states) changed since the last build
+        flow_field = self.flow_fields[is_immune_to_wall]
+        state = (self.goal, self.maze.version)
+        if flow_field.state != state:
+            flow_field.rebuild(self.goal, self.maze, state)
+        return flow_field
+
+    def next_step(self, start, is_immune_to_wall=False, deadline=None):
+        # Step toward the goal, searching further first if needed, None when the deadline ran out before an answer
+        flow_field = self.get_flow_field(is_immune_to_wall)
+        if not flow_field.expand_until(*start, deadline):
+            return None
+        return flow_field.next_step(start)
+
+    def is_settled(self, start, is_immune_to_wall=False):
+        return self.get_flow_field(is_immune_to_wall).is_settled(*start)
+
+    def stale_step(self, start, is_immune_to_wall=False):
+        # Step from the last search toward wherever the goal was then, for enemies that may not search now
+        flow_field = self.get_flow_field(is_immune_to_wall)
+        if flow_field.distance(*start) != -1:
+            return flow_field.next_step(start)
+        return flow_field.next_step(start, flow_field.previous_distances)
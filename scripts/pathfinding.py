@@ -0,0 +1,360 @@
+# pathfinding.py
+
+import heapq, time
+import numpy as np
+from abc import ABC, abstractmethod
+
+INF = float('inf')
+
+# Counters summed over every pathfinder instance, by algorithm name
+SEARCH_STATS = {}
+
+class Pathfinder(ABC):
+    # Shared interface: find_path(start, goal, maze, mode, deadline) returns the steps after start up to goal, [] if
+    # unreachable, or None when the deadline passed first, asking the same query again picks the search back up
+    name = None
+    incremental = False  # Incremental pathfinders keep state between queries, so every enemy needs its own
+
+    def __init__(self):
+        self.nodes_expanded = 0
+        self.full_searches = 0  # Queries that searched from scratch
+
+        # Per-cell search state in flat arrays, reused across queries and cleared by bumping the generation
+        self.size = 0
+        self.generation = 0
+        self.seen = []
+        self.closed = []
+        self.g_score = []
+        self.came_from = []
+
+    def reset(self, size):
+        if size != self.size:
+            self.size = size
+            self.generation = 0
+            self.seen = [0] * size
+            self.closed = [0] * size
+            self.g_score = [0] * size
+            self.came_from = [-1] * size
+        self.generation += 1
+
+    def find_path(self, start, goal, maze, mode, deadline=None):
+        start_time = time.perf_counter()
+        nodes_expanded, full_searches = self.nodes_expanded, self.full_searches
+        path = self.search(start, goal, maze, mode, deadline)
+        search_time = time.perf_counter() - start_time
+
+        totals = SEARCH_STATS.setdefault(self.name, {"queries": 0, "nodes_expanded": 0, "full_searches": 0, "search_ms": 0.0})
+        totals["queries"] += path is not None  # A search cut short counts once, when it finishes
+        totals["nodes_expanded"] += self.nodes_expanded - nodes_expanded
+        totals["full_searches"] += self.full_searches - full_searches
+        totals["search_ms"] += search_time * 1000
+        return path
+
+    @abstractmethod
+    def search(self, start, goal, maze, mode, deadline=None):
+        pass
+
+    def build_path(self, goal_index, cols):
+        # Follow came_from back to the start, which has no parent
+        path = []
+        index = goal_index
+        while self.came_from[index] != -1:
+            path.append((index % cols, index // cols))
+            index = self.came_from[index]
+        path.reverse()
+        return path
+
+class AStarPathfinder(Pathfinder):
+    name = "astar"
+
+    def __init__(self):
+        super().__init__()
+        self.suspended = None  # (query, open set) of the search the last deadline cut short
+
+    def search(self, start, goal, maze, mode, deadline=None):
+        # A* on the 4-connected grid with the Manhattan heuristic, equal f prefers the deeper node
+        walkable, cols, rows = maze.walkable_list(mode), maze.cols, maze.rows
+        start_x, start_y = start
+        goal_x, goal_y = goal
+        if not (0 <= goal_x < cols and 0 <= goal_y < rows) or not walkable[goal_y * cols + goal_x]:
+            return []
+        start_index, goal_index = start_y * cols + start_x, goal_y * cols + goal_x
+
+        # Shared by every enemy, so only the one suspended search survives, and only for the exact same query
+        query = (start, goal, mode, maze, maze.version)
+        if self.suspended is not None and self.suspended[0] == query:
+            open_set = self.suspended[1]
+        else:
+            self.reset(cols * rows)
+            self.full_searches += 1
+            self.seen[start_index], self.g_score[start_index], self.came_from[start_index] = self.generation, 0, -1
+            open_set = [(abs(start_x - goal_x) + abs(start_y - goal_y), 0, start_index)]
+        self.suspended = None
+        generation, seen, closed, g_score, came_from = self.generation, self.seen, self.closed, self.g_score, self.came_from
+        expanded = 0
+
+        while open_set:
+            _, negative_g, index = heapq.heappop(open_set)
+            if closed[index] == generation:
+                continue  # Stale entry, a cheaper one was already expanded
+            closed[index] = generation
+            expanded += 1
+            if index == goal_index:
+                self.nodes_expanded += expanded
+                return self.build_path(goal_index, cols)
+
+            x, y = index % cols, index // cols
+            next_g = 1 - negative_g
+            for nx, ny, neighbor in ((x + 1, y, index + 1), (x - 1, y, index - 1), (x, y + 1, index + cols), (x, y - 1, index - cols)):
+                if 0 <= nx < cols and 0 <= ny < rows and walkable[neighbor] and closed[neighbor] != generation:
+                    if seen[neighbor] != generation or next_g < g_score[neighbor]:
+                        seen[neighbor], g_score[neighbor], came_from[neighbor] = generation, next_g, index
+                        heapq.heappush(open_set, (next_g + abs(nx - goal_x) + abs(ny - goal_y), -next_g, neighbor))
+
+            if deadline is not None and expanded % 256 == 0 and time.perf_counter() >= deadline:
+                self.nodes_expanded += expanded
+                self.suspended = (query, open_set)
+                return None
+
+        self.nodes_expanded += expanded
+        return []
+
+class DStarLitePathfinder(Pathfinder):
+    # D* Lite searches backward from a root goal and keeps its search between queries. The enemy walking along
+    # the path only shifts the key modifier and a door changing walkability only repairs around that door.
+    # Moving the root itself would change every distance, so a goal that drifted a few tiles keeps the root and
+    # gets a short last leg instead, costing at most two steps per tile of drift; farther jumps start over
+    name = "dstar"
+    incremental = True
+    goal_drift = 2
+
+    def __init__(self):
+        super().__init__()
+        self.maze = None
+        self.mode = None
+        self.goal = None
+        self.last_start = None
+        self.key_modifier = 0
+        self.walkable = []
+        self.mask = None
+        self.g = []
+        self.rhs = []
+        self.queued_key = []  # Key a cell is queued under, None when not queued, older heap entries are skipped
+        self.open_set = []
+
+    def initialize(self, start, goal, maze, mode):
+        self.full_searches += 1
+        self.maze, self.mode, self.version = maze, mode, maze.version
+        self.cols, self.rows = maze.cols, maze.rows
+        self.walkable = maze.walkable_list(mode)
+        self.mask = maze.walkable_mask(mode)  # Both are replaced, never written, when the maze changes
+        size = self.cols * self.rows
+        self.g = [INF] * size
+        self.rhs = [INF] * size
+        self.queued_key = [None] * size
+        self.open_set = []
+        self.key_modifier = 0
+        self.goal, self.last_start = goal, start
+
+        goal_index = goal[1] * self.cols + goal[0]
+        self.rhs[goal_index] = 0
+        self.push(goal_index)
+
+    def heuristic(self, index):
+        start_x, start_y = self.last_start
+        return abs(index % self.cols - start_x) + abs(index // self.cols - start_y)
+
+    def get_key(self, index):
+        best = min(self.g[index], self.rhs[index])
+        return (best + self.heuristic(index) + self.key_modifier, best)
+
+    def push(self, index):
+        key = self.get_key(index)
+        self.queued_key[index] = key
+        heapq.heappush(self.open_set, (key, index))
+
+    def get_neighbors(self, index):
+        x, cols = index % self.cols, self.cols
+        neighbors = []
+        if x + 1 < cols:
+            neighbors.append(index + 1)
+        if x > 0:
+            neighbors.append(index - 1)
+        if index + cols < len(self.g):
+            neighbors.append(index + cols)
+        if index >= cols:
+            neighbors.append(index - cols)
+        return neighbors
+
+    def update_vertex(self, index):
+        if index != self.goal[1] * self.cols + self.goal[0]:
+            best = INF
+            if self.walkable[index]:
+                for neighbor in self.get_neighbors(index):
+                    if self.walkable[neighbor] and self.g[neighbor] + 1 < best:
+                        best = self.g[neighbor] + 1
+            self.rhs[index] = best
+        if self.g[index] != self.rhs[index]:
+            self.push(index)
+        else:
+            self.queued_key[index] = None
+
+    def compute_shortest_path(self, start_index, deadline=None):
+        # False when the deadline passed first, the queue keeps everything done so far for the next call
+        g, rhs, queued_key, open_set, walkable = self.g, self.rhs, self.queued_key, self.open_set, self.walkable
+        cols, size, key_modifier = self.cols, len(g), self.key_modifier
+        start_x, start_y = self.last_start
+        root_index = self.goal[1] * cols + self.goal[0]
+        heappush, heappop = heapq.heappush, heapq.heappop
+        expanded = 0
+        while open_set:
+            key, index = open_set[0]
+            if queued_key[index] != key:
+                heappop(open_set)  # Superseded entry
+                continue
+            start_best = min(g[start_index], rhs[start_index])
+            if key >= (start_best + key_modifier, start_best) and rhs[start_index] == g[start_index]:
+                break
+            heappop(open_set)
+            expanded += 1
+
+            best = min(g[index], rhs[index])
+            x = index % cols
+            new_key = (best + abs(x - start_x) + abs(index // cols - start_y) + key_modifier, best)
+            if key < new_key:
+                queued_key[index] = new_key  # The enemy moved since this cell was queued
+                heappush(open_set, (new_key, index))
+            elif g[index] > rhs[index]:
+                # Settled: neighbours can only get cheaper through this cell
+                g[index] = through = rhs[index]
+                through += 1
+                queued_key[index] = None
+                for neighbor in (index + 1 if x + 1 < cols else -1, index - 1 if x > 0 else -1, index + cols, index - cols):
+                    if 0 <= neighbor < size and walkable[neighbor] and through < rhs[neighbor] and neighbor != root_index:
+                        rhs[neighbor] = through
+                        if g[neighbor] == through:
+                            queued_key[neighbor] = None  # Consistent again
+                            continue
+                        neighbor_best = through if through < g[neighbor] else g[neighbor]
+                        neighbor_key = (neighbor_best + abs(neighbor % cols - start_x) + abs(neighbor // cols - start_y) + key_modifier, neighbor_best)
+                        queued_key[neighbor] = neighbor_key
+                        heappush(open_set, (neighbor_key, neighbor))
+            else:
+                # Got more expensive: neighbours that relied on this cell look for another way
+                old_through = g[index] + 1
+                g[index] = INF
+                self.update_vertex(index)
+                for neighbor in self.get_neighbors(index):
+                    if rhs[neighbor] == old_through:
+                        self.update_vertex(neighbor)
+
+            if deadline is not None and expanded % 256 == 0 and time.perf_counter() >= deadline:
+                self.nodes_expanded += expanded
+                return False
+        self.nodes_expanded += expanded
+        return True
+
+    def search(self, start, goal, maze, mode, deadline=None):
+        cols, rows = maze.cols, maze.rows
+        goal_x, goal_y = goal
+        if not (0 <= goal_x < cols and 0 <= goal_y < rows) or not maze.walkable_list(mode)[goal_y * cols + goal_x]:
+            return []
+
+        if maze is not self.maze or mode != self.mode or abs(goal_x - self.goal[0]) + abs(goal_y - self.goal[1]) > self.goal_drift:
+            self.initialize(start, goal, maze, mode)  # New floor, movement mode or a jump like a teleport
+        else:
+            # The enemy moved: raise every queued key instead of re-keying the queue
+            self.key_modifier += abs(start[0] - self.last_start[0]) + abs(start[1] - self.last_start[1])
+            self.last_start = start
+
+            if maze.version != self.version:
+                # Repair only around the cells whose walkability changed
+                self.version = maze.version
+                mask = maze.walkable_mask(mode)
+                changed = np.flatnonzero(mask != self.mask).tolist()
+                self.walkable, self.mask = maze.walkable_list(mode), mask
+                for index in changed:
+                    self.update_vertex(index)
+                    for neighbor in self.get_neighbors(index):
+                        self.update_vertex(neighbor)
+
+        leg = []
+        if goal != self.goal:
+            leg = self.find_leg(goal)
+            if leg is None or not self.walkable[self.goal[1] * cols + self.goal[0]]:
+                self.initialize(start, goal, maze, mode)  # Close by but walled off from the root, or the root got walled in
+                leg = []
+
+        start_index = start[1] * cols + start[0]
+        if not self.compute_shortest_path(start_index, deadline):
+            return None
+        if self.g[start_index] == INF and goal != self.goal:
+            # The root is cut off from the enemy but the goal may not be, search for the goal itself
+            self.initialize(start, goal, maze, mode)
+            leg = []
+            if not self.compute_shortest_path(start_index, deadline):
+                return None
+        if self.g[start_index] == INF:
+            return []
+
+        # Walk downhill on g from the start, every step is one closer to the root
+        path = []
+        index, root_index = start_index, self.goal[1] * cols + self.goal[0]
+        while index != root_index:
+            index = min((neighbor for neighbor in self.get_neighbors(index) if self.walkable[neighbor]), key=self.g.__getitem__)
+            path.append((index % cols, index // cols))
+            if index % cols == goal_x and index // cols == goal_y:
+                return path  # The goal drifted onto the way there, this part is still a shortest path
+        return self.remove_loops(start, path + leg)
+
+    def find_leg(self, goal):
+        # Steps from the root to a goal within the drift limit, None when it is farther away than that
+        root_index = self.goal[1] * self.cols + self.goal[0]
+        goal_index = goal[1] * self.cols + goal[0]
+        came_from = {root_index: None}
+        frontier = [root_index]
+        for _ in range(self.goal_drift):
+            next_frontier = []
+            for index in frontier:
+                for neighbor in self.get_neighbors(index):
+                    if self.walkable[neighbor] and neighbor not in came_from:
+                        came_from[neighbor] = index
+                        next_frontier.append(neighbor)
+            self.nodes_expanded += len(frontier)
+            frontier = next_frontier
+            if goal_index in came_from:
+                leg = []
+                index = goal_index
+                while index != root_index:
+                    leg.append((index % self.cols, index // self.cols))
+                    index = came_from[index]
+                return leg[::-1]
+        return None
+
+    def remove_loops(self, start, path):
+        # Going to the root and back out to the goal can cross itself, cut out anything between two visits
+        result = []
+        positions = {start: -1}
+        for cell in path:
+            if cell in positions:
+                del result[positions[cell] + 1:]
+                positions = {start: -1, **{kept: index for index, kept in enumerate(result)}}
+            else:
+                positions[cell] = len(result)
+                result.append(cell)
+        return result
+
+PATHFINDER_CLASSES = {pathfinder_class.name: pathfinder_class for pathfinder_class in (AStarPathfinder, DStarLitePathfinder)}
+SHARED_PATHFINDERS = {}
+
+def get_pathfinder(name):
+    # Stateless searches are shared by every enemy using them, incremental ones belong to one enemy
+    pathfinder_class = PATHFINDER_CLASSES[name]
+    if pathfinder_class.incremental:
+        return pathfinder_class()
+    if name not in SHARED_PATHFINDERS:
+        SHARED_PATHFINDERS[name] = pathfinder_class()
+    return SHARED_PATHFINDERS[name]
+
+def get_pathfinding_stats():
+    return {name: dict(stats) for name, stats in SEARCH_STATS.items()}
@@ -0,0 +1,59 @@
+# placement.py
+
+import numpy as np
+from settings import *
+from maze_grid import PATH, STRUCTURE_TILES
+
+class PlacementIndex:
+    def __init__(self, maze, center_x, center_y, min_distance_from_center=12, min_distance_from_structure=12):
+        # Built once per floor: every 'O' cell far enough from the safe zone and the portal structure
+        rows, cols = maze.rows, maze.cols
+        grid_y, grid_x = np.mgrid[0:rows, 0:cols]
+        center_distance = (grid_x - center_x) ** 2 + (grid_y - center_y) ** 2
+
+        # Squared distance to the nearest structure tile, only worked out in the window where it can be too close
+        structure_distance = np.full((rows, cols), np.inf)
+        structure_y, structure_x = np.nonzero(maze.tile_mask(STRUCTURE_TILES))
+        if len(structure_y):
+            top, left = max(0, structure_y.min() - min_distance_from_structure), max(0, structure_x.min() - min_distance_from_structure)
+            bottom, right = structure_y.max() + min_distance_from_structure + 1, structure_x.max() + min_distance_from_structure + 1
+            window = structure_distance[top:bottom, left:right]
+            window_y, window_x = grid_y[top:bottom, left:right], grid_x[top:bottom, left:right]
+            for tile_y, tile_x in zip(structure_y, structure_x):
+                np.minimum(window, (window_x - tile_x) ** 2 + (window_y - tile_y) ** 2, out=window)
+
+        inner = np.zeros((rows, cols), dtype=bool)
+        inner[1:rows - 1, 1:cols - 1] = True  # Never on the outer ring
+        self.path_cells = np.flatnonzero((maze.codes == PATH) & inner)
+        eligible = (
+            (maze.codes == PATH) & inner &
+            (center_distance >= min_distance_from_center ** 2) &
+            (structure_distance >= min_distance_from_structure ** 2)
+        )
+        self.eligible_cells = np.flatnonzero(eligible)
+        self.cols = cols
+
+    def get_order(self, cells, rng, quick_tries=32):
+        # A few random draws first, usually enough on an open floor, then every cell once in random order
+        generator = np.random.default_rng(rng.getrandbits(64))
+        if len(cells):
+            yield from cells[generator.integers(len(cells), size=quick_tries)].tolist()
+        yield from cells[generator.permutation(len(cells))].tolist()
+
+    def pick(self, count, min_distance, taken=(), rng=RNG):
+        # Dart throwing over the shuffled eligible cells, keeping min_distance from taken and picked points
+        # Each cell is tried at most once, so it always ends; short of cells it relaxes the spacing, then the eligibility
+        picked = []
+        points = list(taken)
+        for cells, spacing in ((self.eligible_cells, min_distance), (self.eligible_cells, 0), (self.path_cells, 0)):
+            for cell in self.get_order(cells, rng):
+                if len(picked) == count:
+                    return picked
+                x, y = cell % self.cols, cell // self.cols
+                if (x, y) in points or any((x - px) ** 2 + (y - py) ** 2 < spacing ** 2 for px, py in points):
+                    continue
+                picked.append((x, y))
+                points.append((x, y))
+            if len(picked) == count:
+                return picked
+        return picked  # The floor has fewer free path cells than requested
@@ -23,6 +23,7 @@ class Player:
         self.maze_interaction_triggered = False
 
         self.float_x, self.float_y = x, y
+        self.previous_float_x, self.previous_float_y = x, y  # Position at the start of the last step
         self.safe_zone_pos = (x, y)
         self.start_pos = (x, y)
         self.target_pos = (x, y)
@@ -42,10 +43,7 @@ class Player:
         self.min_bonus_limit = INIT_MIN_BONUS_LIMIT
         
         # Load animations for each state
-        self.animations = {
-            state: split_and_resize_sprite(path) 
-            for state, path in PLAYER_SPRITES.items()
-        }
+        self.animations = ASSETS.animations("player", PLAYER_SPRITES)  # Frames shared by every instance
         self.current_state = "right"  # Start in default state
         self.frame_index = 0
         self.animation_timer = 0
@@ -65,14 +63,8 @@ class Player:
         new_x = self.x + dx
         new_y = self.y + dy
 
-        # Ensure the position is within maze bounds
-        rows = len(maze)
-        cols = len(maze[0])
-        if not (0 <= new_x < cols and 0 <= new_y < rows):
-            return False
-
-        # Check if the tile is walkable
-        return maze[new_y][new_x] not in {'X', 'DL', 'DI'}
+        # Check the tile is within maze bounds and walkable
+        return maze.is_walkable(new_x, new_y, 'player')
 
     def set_direction(self, dx, dy, maze):
         # Set a new direction if it's a valid move
@@ -98,7 +90,7 @@ class Player:
             self.float_x, self.float_y = self.x, self.y
             self.is_moving = False
 
-    def move(self, delta_time, keys, active_powerups, maze):
+    def move(self, delta_time, key_index, powerup_index, maze):
         if self.is_moving:
             # Calculate the movement step
             move_distance = delta_time * (self.speed * self.speed_multiplier)
@@ -130,8 +122,8 @@ class Player:
         self.update_frame(delta_time)
 
         # Check for key collection and door
-        check_key_collection(self, keys)
-        check_powerup_collection(self, active_powerups)
+        check_key_collection(self, key_index)
+        check_powerup_collection(self, powerup_index)
     
     def update_frame(self, delta_time):
         self.animation_timer += delta_time
@@ -142,14 +134,16 @@ class Player:
             self.animation_timer = 0
             self.frame_index = (self.frame_index + 1) % len(frames)
 
-    def draw(self, win, camera, opacity):
-        # Adjust position by camera and draw player
-        adjusted_rect = camera.apply(self)
+    def store_previous_position(self):
+        self.previous_float_x, self.previous_float_y = self.float_x, self.float_y
+
+    def get_blit(self, camera, opacity, alpha=1.0):
+        # Adjust position by camera and return the player frame for batched drawing
+        x, y = camera.apply_interpolated(self, alpha)
         current_frame = self.animations[self.current_state][self.frame_index]
-        temp_frame = current_frame.copy()
-        temp_frame.fill((255, 255, 255, opacity), special_flags=pygame.BLEND_RGBA_MULT)
-        adjusted_rect = adjusted_rect.move(-temp_frame.get_width() // 4, (-temp_frame.get_height() // 4) - 8)
-        win.blit(temp_frame, adjusted_rect)
+        if opacity < 255:
+            current_frame = SURFACE_CACHE.get(current_frame, "opacity", opacity)  # Faded frames are made once, not every draw
+        return current_frame, (x - current_frame.get_width() // 4, y - current_frame.get_height() // 4 - 8)
 
     def update_timer(self, delta_time):
         # Decrement the timer by the elapsed time
@@ -177,8 +171,8 @@ class Player:
         self.timer += self.bonus_time
         self.floor_up_start_time = None
     
-    def activate_powerup(self, enemies):
-        self.current_powerup.activate(self, enemies)
+    def activate_powerup(self, enemies, scheduler):
+        self.current_powerup.activate(self, enemies, scheduler)
         self.has_powerup = False
         self.current_powerup = None
         AudioSystem.play_sfx("skill_activated")
@@ -187,6 +181,7 @@ class Player:
         # Update the player's position to the safe zone
         self.x, self.y = self.safe_zone_pos
         self.float_x, self.float_y = self.safe_zone_pos
+        self.store_previous_position()  # Teleports are not interpolated
 
         # Update the player's rect for rendering
         self.rect.topleft = (int(self.x * TILE_SIZE), int(self.y * TILE_SIZE))
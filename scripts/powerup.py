@@ -1,12 +1,11 @@
 # powerup.py
 
-import pygame, random, math, threading
+import pygame, math
 from settings import *
 from maze import *
+from placement import PlacementIndex
 from audio_system import AudioSystem
 
-POWERUP_SPAWN_EVENT = pygame.USEREVENT + 2 
-
 class Powerup:
     def __init__(self, x, y, name, type, duration):
         self.x = x
@@ -17,12 +16,12 @@ class Powerup:
         self.collected = False
         self.rect = pygame.Rect(self.x * TILE_SIZE, self.y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
     
-    def draw(self, win, camera):
-        x, y = camera.apply_to_maze(self.x, self.y)
+    def get_blit(self, camera):
+        # Sprite and screen position for batched drawing
         powerup_sprite = POWERUP_OBJECTS[self.type]
-        win.blit(powerup_sprite, (x, y))
+        return powerup_sprite, camera.apply_to_maze(self.x, self.y)
     
-    def activate(self, player, enemies):
+    def activate(self, player, enemies, scheduler):
         pass
 
 # Subclasses for each powerup
@@ -31,9 +30,9 @@ class RocketBoost(Powerup):
     def __init__(self, x, y):
         super().__init__(x, y, "Rocket Boost", "rocket_boost", 4.0)
 
-    def activate(self, player, enemies):
+    def activate(self, player, enemies, scheduler):
         player.speed_multiplier += 0.5
-        threading.Timer(self.duration, self.deactivate, args=(player,)).start()
+        scheduler.schedule(self.duration, self.deactivate, player, scope='run')
 
     def deactivate(self, player):
         player.speed_multiplier -= 0.5
@@ -42,9 +41,9 @@ class Retreat(Powerup):
     def __init__(self, x, y):
         super().__init__(x, y, "Retreat", "retreat", 2.5)
 
-    def activate(self, player, enemies):
+    def activate(self, player, enemies, scheduler):
         player.speed_multiplier -= 0.75
-        threading.Timer(self.duration, self.deactivate, args=(player,)).start()
+        scheduler.schedule(self.duration, self.deactivate, player, scope='run')
 
     def deactivate(self, player):
         player.speed_multiplier += 0.75
@@ -55,10 +54,10 @@ class Immunity(Powerup):
     def __init__(self, x, y):
         super().__init__(x, y, "Immunity", "immunity", 5.0)
 
-    def activate(self, player, enemies):
+    def activate(self, player, enemies, scheduler):
         player.is_immune = True
         player.can_collect = False
-        threading.Timer(self.duration, self.deactivate, args=(player,)).start()
+        scheduler.schedule(self.duration, self.deactivate, player, scope='run')
 
     def deactivate(self, player):
         player.is_immune = False
@@ -68,65 +67,42 @@ class SlowMove(Powerup):
     def __init__(self, x, y):
         super().__init__(x, y, "Slow Move", "slow_move", 5.0)
 
-    def activate(self, player, enemies):
+    def activate(self, player, enemies, scheduler):
         for enemy in enemies:
             enemy.speed_multiplier -= 0.25
-        threading.Timer(self.duration, self.deactivate, args=(enemies,)).start()
+        scheduler.schedule(self.duration, self.deactivate, enemies)  # Floor scoped, the enemies go away with the floor
 
     def deactivate(self, enemies):
         for enemy in enemies:
             enemy.speed_multiplier += 0.25
 
 
-def generate_powerups(maze, center_x, center_y, active_powerups, powerup_classes):
-    min_distance_from_center = 12
+def generate_powerups(maze, center_x, center_y, active_powerups, powerup_classes, placement=None):
     min_distance_from_powerup = 8
-    min_distance_from_structure = 12
-    structure_tiles = {'S', 'P', 'DL', 'DU', 'DI'}
-    new_powerup = None
-
-    while new_powerup is None:
-        # Generate random coordinates within maze bounds
-        x, y = random.randint(1, len(maze[0]) - 2), random.randint(1, len(maze) - 2)
-
-        # Calculate distance from maze center
-        distance_from_center = math.sqrt((x - center_x) ** 2 + (y - center_y) ** 2)
-
-        # Ensure the tile is walkable and far enough from the maze center
-        if maze[y][x] == 'O' and distance_from_center >= min_distance_from_center:
-            # Check if the new powerup is too close to any existing powerups
-            too_close_to_powerup = any(
-                math.sqrt((x - powerup.x) ** 2 + (y - powerup.y) ** 2) < min_distance_from_powerup
-                for powerup in active_powerups
-            )
-
-            # Check if the new powerup is too close to any portal structure tile
-            too_close_to_structure = any(
-                math.sqrt((x - j) ** 2 + (y - i) ** 2) < min_distance_from_structure
-                for i in range(max(0, y - min_distance_from_structure), min(len(maze), y + min_distance_from_structure + 1))
-                for j in range(max(0, x - min_distance_from_structure), min(len(maze[0]), x + min_distance_from_structure + 1))
-                if maze[i][j] in structure_tiles
-            )
-
-            powerup_types = list(powerup_classes.keys())
-            weights = [powerup_classes[ptype][1] for ptype in powerup_types]
-
-            # If the new powerup position is valid, add it to the list
-            if not too_close_to_powerup and not too_close_to_structure:
-                powerup_type = random.choices(powerup_types, weights=weights, k=1)[0]
-                powerup_class = POWERUP_CLASSES[powerup_type][0]
-                new_powerup = powerup_class(x, y)
-
-    return new_powerup
-
-def check_powerup_collection(player, powerups):
-    # Check if the player can collect a powerup
-    for powerup in powerups:
-        if not powerup.collected and player.x == powerup.x and player.y == powerup.y and not player.has_powerup and player.can_collect:
+    if placement is None:
+        placement = PlacementIndex(maze, center_x, center_y)
+
+    # Keep away from every powerup still on the floor or held
+    picked = placement.pick(1, min_distance_from_powerup, [(powerup.x, powerup.y) for powerup in active_powerups])
+    if not picked:
+        return None
+
+    powerup_types = list(powerup_classes.keys())
+    weights = [powerup_classes[ptype][1] for ptype in powerup_types]
+    powerup_type = RNG.choices(powerup_types, weights=weights, k=1)[0]
+    powerup_class = POWERUP_CLASSES[powerup_type][0]
+    return powerup_class(*picked[0])
+
+def check_powerup_collection(player, powerup_index):
+    # Check if the player can collect a powerup, only the powerups on the player's tile are looked at
+    for powerup in powerup_index.at(player.x, player.y):
+        if not powerup.collected and not player.has_powerup and player.can_collect:
             player.current_powerup = powerup
             player.has_powerup = True
             powerup.collected = True
+            powerup_index.remove(powerup)
             AudioSystem.play_sfx("powerup_collected")
+            break
 
 
 POWERUP_CLASSES = {
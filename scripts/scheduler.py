@@ -0,0 +1,64 @@
+# scheduler.py
+
+import heapq, itertools
+
+class ScheduledEvent:
+    __slots__ = ('due_time', 'callback', 'args', 'scope', 'interval', 'name', 'cancelled')
+
+    def __init__(self, due_time, callback, args, scope, interval, name):
+        self.due_time = due_time
+        self.callback = callback
+        self.args = args
+        self.scope = scope
+        self.interval = interval  # Seconds between repeats, None for a one-shot event
+        self.name = name
+        self.cancelled = False
+
+class Scheduler:
+    def __init__(self):
+        self.time = 0.0  # Game time, only advanced by update
+        self.queue = []  # Heap of (due time, insertion order, event)
+        self.counter = itertools.count()  # Keeps events due at the same time in scheduling order
+        self.named_events = {}
+
+    def schedule(self, delay, callback, *args, scope='floor', interval=None, name=None):
+        # Run callback(*args) after delay seconds of game time, a name replaces any pending event with that name
+        if name is not None:
+            self.cancel(name)
+        event = ScheduledEvent(self.time + delay, callback, args, scope, interval, name)
+        heapq.heappush(self.queue, (event.due_time, next(self.counter), event))
+        if name is not None:
+            self.named_events[name] = event
+        return event
+
+    def schedule_repeating(self, interval, callback, *args, scope='floor', name=None):
+        return self.schedule(interval, callback, *args, scope=scope, interval=interval, name=name)
+
+    def cancel(self, event):
+        # Accepts an event or the name it was scheduled under, cancelled events are dropped when popped
+        if isinstance(event, str):
+            event = self.named_events.pop(event, None)
+        elif event is not None and self.named_events.get(event.name) is event:
+            del self.named_events[event.name]
+        if event is not None:
+            event.cancelled = True
+
+    def cancel_scope(self, scope):
+        # Drop every pending event of a scope, e.g. 'floor' effects when a new floor starts
+        for _, _, event in self.queue:
+            if event.scope == scope:
+                self.cancel(event)
+
+    def update(self, delta_time):
+        # Advance game time and fire everything that came due, in due time order
+        self.time += delta_time
+        while self.queue and self.queue[0][0] <= self.time:
+            _, _, event = heapq.heappop(self.queue)
+            if event.cancelled:
+                continue
+            if event.interval is not None:
+                event.due_time += event.interval
+                heapq.heappush(self.queue, (event.due_time, next(self.counter), event))
+            elif self.named_events.get(event.name) is event:
+                del self.named_events[event.name]
+            event.callback(*event.args)
@@ -1,12 +1,14 @@
 # settings.py
 
-import pygame
+import pygame, random
 from utils import *
+from assets import ASSETS, SURFACE_LOCK
 
 
 # Display settings
 WIDTH, HEIGHT = 960, 640
 TILE_SIZE = 16  # Size of each tile in pixels
+MAX_BAKED_MAZE_PIXELS = 4096 * 4096  # Larger floors are drawn tile by tile inside the viewport
 INIT_ROWS, INIT_COLS = 33, 33
 PORTAL_STRUCTURE_SIZE = 3
 
@@ -29,6 +31,11 @@ pygame.display.set_caption("Tomb Rush")
 
 # Frame rate
 FPS = 60
+FIXED_DT = 1 / 60  # Simulation step in seconds, independent of the render frame rate
+MAX_FRAME_TIME = 0.25  # Longer frames are clamped so a stall never runs a burst of catch-up steps
+
+# Gameplay randomness (maze, keys, powerups, enemies) draws from one generator seeded per run
+RNG = random.Random()
 
 # Paths to resources
 FONTS = {
@@ -58,6 +65,26 @@ AUDIO = {
     }
 }
 
+# Sound effects play on a pool of reserved mixer channels, a full pool gives way to higher priorities
+SFX_CHANNELS = 8
+SFX_PRIORITIES = {
+    "button_pressed": 3,
+    "key_collected": 3,
+    "real_key_used": 3,
+    "fake_key_used": 3,
+    "powerup_collected": 3,
+    "skill_activated": 3,
+    "retreat_teleported_to_safe_zone": 3,
+    "portal_teleporting": 2,
+    "specter_special_ambient": 1,
+    "slender_special_ambient": 1
+}  # Anything not listed plays at priority 0
+
+# Enemy ambience gets quieter with distance from the player, in tiles
+AMBIENT_DISTANCE_FALLOFF = True
+AMBIENT_HEARING_DISTANCE = 24
+AMBIENT_MIN_VOLUME = 0.2
+
 # Paths to sprite images
 PLAYER_SPRITES = {
     "up": "sprites/player/up.png",
@@ -215,52 +242,60 @@ UI_ICON_SPRITES = {
     "back_button": "sprites/ui_icons/back_button.png"
 }
 
-PATH_TILES = {state: split_and_resize_sprite(path, TILE_SIZE) for state, path in PATH_TILE_SPRITES.items()}
-WALL_TILES = {state: split_and_resize_sprite(path, TILE_SIZE) for state, path in WALL_TILE_SPRITES.items()}
-DOOR_TILES = {state: {pattern: split_and_resize_sprite(path, TILE_SIZE) for pattern, path in patterns.items()} for state, patterns in DOOR_TILE_SPRITES.items()}
-STRUCTURE_FLOOR_TILES = {state: split_and_resize_sprite(path, TILE_SIZE) for state, path in STRUCTURE_FLOOR_TILE_SPRITES.items()}
-STRUCTURE_PORTAL_TILES = {state: split_and_resize_sprite(path, TILE_SIZE) for state, path in STRUCTURE_PORTAL_TILE_SPRITES.items()}
+# Sprite groups are registered here and loaded from disk on first use, tile and entity frames share atlas pages
+PATH_TILES = ASSETS.group("path_tiles", PATH_TILE_SPRITES, TILE_SIZE, atlas="tiles")
+WALL_TILES = ASSETS.group("wall_tiles", WALL_TILE_SPRITES, TILE_SIZE, atlas="tiles")
+DOOR_TILES = {state: ASSETS.group(f"door_{state}_tiles", patterns, TILE_SIZE, atlas="tiles") for state, patterns in DOOR_TILE_SPRITES.items()}
+STRUCTURE_FLOOR_TILES = ASSETS.group("structure_floor_tiles", STRUCTURE_FLOOR_TILE_SPRITES, TILE_SIZE, atlas="tiles")
+STRUCTURE_PORTAL_TILES = ASSETS.group("structure_portal_tiles", STRUCTURE_PORTAL_TILE_SPRITES, TILE_SIZE, atlas="tiles")
 
-KEY_OBJECTS = {state: split_and_resize_sprite(path, TILE_SIZE)[0] for state, path in KEY_SPRITES.items()}
-POWERUP_OBJECTS = {name: split_and_resize_sprite(path, TILE_SIZE)[0] for name, path in POWERUP_SPRITES.items()}
-KEYPAD_OBJECTS = {name: split_and_resize_sprite(path) for name, path in KEYPAD_SPRITES.items()}
-UI_ICON_OBJECTS = {name: split_and_resize_sprite(path) for name, path in UI_ICON_SPRITES.items()}
+KEY_OBJECTS = ASSETS.group("keys", KEY_SPRITES, TILE_SIZE, atlas="tiles", single_frame=True)
+POWERUP_OBJECTS = ASSETS.group("powerups", POWERUP_SPRITES, TILE_SIZE, atlas="tiles", single_frame=True)
+KEYPAD_OBJECTS = ASSETS.group("keypads", KEYPAD_SPRITES, atlas="ui")
+UI_ICON_OBJECTS = ASSETS.group("ui_icons", UI_ICON_SPRITES)
 
 
 # Initial attributes
 INIT_TIMER = 60
 INIT_MIN_BONUS_LIMIT = 30
 INIT_SPEED_PLAYER = 108.0
+# "pathfinder" only serves targets other than the player's tile, chasing the player reads the shared flow field
 ENEMIES = {
     "pursuer": {
         "init_speed": 6.4,
         "sprites": PURSUER_SPRITES,
-        "offset_y": -8.0
+        "offset_y": -8.0,
+        "pathfinder": "astar"
     },
     "feigner": {
         "init_speed": 6.4,
         "sprites": FEIGNER_SPRITES,
-        "offset_y": -8.0
+        "offset_y": -8.0,
+        "pathfinder": "astar"
     },
     "glimmer": {
         "init_speed": 6.4,
         "sprites": GLIMMER_SPRITES,
-        "offset_y": -8.0
+        "offset_y": -8.0,
+        "pathfinder": "dstar"
     },
     "ambusher": {
         "init_speed": 6.4,
         "sprites": AMBUSHER_SPRITES,
-        "offset_y": 0
+        "offset_y": 0,
+        "pathfinder": "dstar"
     },
     "specter": {
         "init_speed": 6.4,
         "sprites": SPECTER_SPRITES,
-        "offset_y": -4.0
+        "offset_y": -4.0,
+        "pathfinder": "astar"
     },
     "slender": {
         "init_speed": 6.4,
         "sprites": SLENDER_SPRITES,
-        "offset_y": -8.0
+        "offset_y": -8.0,
+        "pathfinder": "astar"
     }
 }
 INIT_MAX_ENEMIES = 3
@@ -271,3 +306,14 @@ INIT_POWERUP_ACTIVATE_COOLDOWN = 2.5
 INIT_POWERUP_SPAWN_COOLDOWN = 8
 MAX_POWERUPS = 4
 MAX_KEYS = 4
+ENEMY_PATH_STALENESS_LIMIT = 32  # Steps an enemy follows a cached path before planning it again
+
+# Enemy thinking, fresh path searches share a time budget per rendered frame
+AI_BUDGET_MS = 2.0
+AI_NEAR_DISTANCE = 12  # Tiles, closer on-screen enemies may search every step
+AI_FAR_THINK_INTERVAL = 0.25  # Seconds between searches for far enemies
+AI_OFFSCREEN_THINK_INTERVAL = 0.5  # Seconds between searches for enemies off the screen
+
+# Frame metrics, toggled in game with F3
+METRICS_WINDOW = 300  # Frames kept for the rolling percentiles
+METRICS_EXPORT_PATH = None  # Per-floor summary file, e.g. "metrics.csv" or "metrics.json", None to disable
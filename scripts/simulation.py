@@ -0,0 +1,239 @@
+# simulation.py
+
+import os, sys
+
+# Run headless from the project root so settings can load sprites without opening a window
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+os.chdir(ROOT_DIR)
+
+import argparse, json, statistics, time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from settings import *
+from game import GameState, MOVEMENT_ACTIONS
+from enemy import EnemyAI
+from pathfinding import get_pathfinding_stats
+from audio_system import AudioSystem
+
+class BotPolicy:
+    # Walks to the nearest key, tries it on the door, then waits on the portal, steering around enemies when it can
+    def __init__(self, use_powerups=False, danger_radius=3):
+        self.use_powerups = use_powerups
+        self.danger_radius = danger_radius
+        self.plan_origin = None
+        self.plan_action = None
+
+    def get_actions(self, state):
+        player, maze = state.player, state.maze
+        origin = player.target_pos if player.is_moving else (player.x, player.y)
+
+        # Only replan once the player reaches a new tile
+        if origin != self.plan_origin:
+            self.plan_origin = origin
+            self.plan_action = self.plan_move(state, origin)
+
+        actions = {self.plan_action} if self.plan_action else set()
+
+        # Try the key on the door whenever standing next to it
+        if player.has_key and any(abs(player.x - door_x) + abs(player.y - door_y) == 1 for door_y, door_x in state.door_positions):
+            actions.add('door')
+
+        # Use a powerup once an enemy gets close
+        if self.use_powerups and player.has_powerup and self.nearest_enemy_distance(state) <= self.danger_radius:
+            actions.add('powerup')
+
+        return actions
+
+    def nearest_enemy_distance(self, state):
+        player = state.player
+        return min((abs(enemy.x - player.x) + abs(enemy.y - player.y) for enemy in state.enemy_objects), default=float('inf'))
+
+    def get_goals(self, state, origin):
+        player, maze = state.player, state.maze
+
+        # Doors open: head for the portal and keep stepping between portal tiles once there
+        if any(maze[door_y][door_x] == 'DU' for door_y, door_x in state.door_positions):
+            portal_tiles = {(x, y) for y in range(maze.rows) for x in range(maze.cols) if maze[y][x] == 'P'}
+            if origin in portal_tiles:
+                return portal_tiles - {origin}
+            return portal_tiles
+
+        # Holding a key: go next to the door
+        if player.has_key:
+            return {
+                (door_x + dx, door_y + dy)
+                for door_y, door_x in state.door_positions
+                for dx, dy in MOVEMENT_ACTIONS.values()
+                if maze.is_walkable(door_x + dx, door_y + dy, 'player') and maze[door_y + dy][door_x + dx] == 'O'
+            }
+
+        # Otherwise collect the nearest remaining key
+        return {(key.x, key.y) for key in state.keys if not key.collected}
+
+    def plan_move(self, state, origin):
+        goals = self.get_goals(state, origin)
+        if not goals:
+            return None
+
+        # Avoid tiles around enemies first, fall back to the plain shortest path
+        danger = {
+            (enemy.x + dx, enemy.y + dy)
+            for enemy in state.enemy_objects
+            for dx, dy in list(MOVEMENT_ACTIONS.values()) + [(0, 0)]
+        } - {origin}
+        step = self.find_first_step(state.maze, origin, goals, danger) or self.find_first_step(state.maze, origin, goals, set())
+        if step is None:
+            return None
+
+        for action, (dx, dy) in MOVEMENT_ACTIONS.items():
+            if (origin[0] + dx, origin[1] + dy) == step:
+                return action
+        return None
+
+    def find_first_step(self, maze, origin, goals, blocked):
+        # Breadth-first search on player-walkable tiles, returns the first step toward the nearest goal
+        walkable = maze.walkable_mask('player')
+        first_steps = {origin: None}
+        frontier = deque([origin])
+        while frontier:
+            x, y = frontier.popleft()
+            if (x, y) in goals and (x, y) != origin:
+                return first_steps[(x, y)]
+            for dx, dy in MOVEMENT_ACTIONS.values():
+                nx, ny = x + dx, y + dy
+                if (nx, ny) not in first_steps and (nx, ny) not in blocked and maze.in_bounds(nx, ny) and walkable[ny, nx]:
+                    first_steps[(nx, ny)] = first_steps[(x, y)] or (nx, ny)
+                    frontier.append((nx, ny))
+        return None
+
+def run_simulation(seed, max_floors=10, max_time=600.0, delta_time=FIXED_DT, use_powerups=True):
+    # Play one run headless at an uncapped tick rate and report how far the bot got
+    AudioSystem.muted = True
+    state = GameState(render=False, seed=seed, prefetch=False)
+    policy = BotPolicy(use_powerups)
+
+    floor = state.player.floor
+    floor_start_time = 0.0
+    time_to_key = []
+    time_to_unlock = []
+    key_found, door_unlocked = False, False
+    death_cause = None
+    ticks = 0
+    path_cache_hits, path_cache_misses = EnemyAI.path_cache_hits, EnemyAI.path_cache_misses
+    pathfinding_start = get_pathfinding_stats()
+    start_time = time.perf_counter()
+
+    while state.time < max_time and state.player.floor <= max_floors:
+        game_over = state.update(policy.get_actions(state), delta_time)
+        ticks += 1
+        player = state.player
+
+        # Per-floor milestones
+        if player.floor != floor:
+            floor, floor_start_time = player.floor, state.time
+            key_found, door_unlocked = False, False
+        if player.has_key and not key_found:
+            key_found = True
+            time_to_key.append(state.time - floor_start_time)
+        if not door_unlocked and any(state.maze[door_y][door_x] == 'DU' for door_y, door_x in state.door_positions):
+            door_unlocked = True
+            time_to_unlock.append(state.time - floor_start_time)
+
+        if game_over:
+            death_cause = 'timer' if player.timer <= 0 else 'enemy'
+            break
+
+    return {
+        "seed": seed,
+        "floor_reached": min(state.player.floor, max_floors),
+        "survived": death_cause is None,
+        "death_cause": death_cause,
+        "game_time": state.time,
+        "time_to_key": time_to_key,
+        "time_to_unlock": time_to_unlock,
+        "ticks": ticks,
+        "wall_time": time.perf_counter() - start_time,
+        "path_cache_hits": EnemyAI.path_cache_hits - path_cache_hits,
+        "path_cache_misses": EnemyAI.path_cache_misses - path_cache_misses,
+        "pathfinding": {
+            name: {counter: value - pathfinding_start.get(name, {}).get(counter, 0) for counter, value in stats.items()}
+            for name, stats in get_pathfinding_stats().items()
+        }
+    }
+
+def run_batch(runs, seed=0, workers=None, **options):
+    # Fan the runs out across cores, one seed per run
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(partial(run_simulation, **options), range(seed, seed + runs)))
+
+def summarize(results):
+    # Aggregate survival, floor reached and time-to-key statistics
+    floors = [result["floor_reached"] for result in results]
+    key_times = [value for result in results for value in result["time_to_key"]]
+    unlock_times = [value for result in results for value in result["time_to_unlock"]]
+    ticks = sum(result["ticks"] for result in results)
+    wall_time = sum(result["wall_time"] for result in results)
+    path_cache_hits = sum(result["path_cache_hits"] for result in results)
+    path_cache_lookups = path_cache_hits + sum(result["path_cache_misses"] for result in results)
+    pathfinding = {}
+    for result in results:
+        for name, stats in result["pathfinding"].items():
+            totals = pathfinding.setdefault(name, dict.fromkeys(stats, 0))
+            for counter, value in stats.items():
+                totals[counter] += value
+
+    def describe(values):
+        if not values:
+            return None
+        return {
+            "mean": round(statistics.mean(values), 2),
+            "median": round(statistics.median(values), 2),
+            "p90": round(sorted(values)[int(0.9 * (len(values) - 1))], 2),
+            "max": round(max(values), 2)
+        }
+
+    return {
+        "runs": len(results),
+        "survival_rate": round(sum(result["survived"] for result in results) / len(results), 3),
+        "death_causes": dict(Counter(result["death_cause"] for result in results if result["death_cause"])),
+        "floor_reached": describe(floors),
+        "floor_histogram": dict(sorted(Counter(floors).items())),
+        "time_to_key": describe(key_times),
+        "time_to_unlock": describe(unlock_times),
+        "ticks_per_second": round(ticks / wall_time) if wall_time else None,
+        "path_cache_hit_rate": round(path_cache_hits / path_cache_lookups, 3) if path_cache_lookups else None,
+        "pathfinding": {
+            name: {
+                "queries": totals["queries"],
+                "nodes_per_query": round(totals["nodes_expanded"] / totals["queries"], 1),
+                "full_search_rate": round(totals["full_searches"] / totals["queries"], 3),
+                "ms_per_query": round(totals["search_ms"] / totals["queries"], 3)
+            }
+            for name, totals in pathfinding.items() if totals["queries"]
+        }
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless bot games and report balance statistics.")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None, help="Process count, defaults to the CPU count")
+    parser.add_argument("--max-floors", type=int, default=10)
+    parser.add_argument("--max-time", type=float, default=600.0, help="Game seconds before a run counts as survived")
+    parser.add_argument("--no-powerups", action="store_true", help="Never activate collected powerups")
+    parser.add_argument("--output", help="Write the summary and every run result to this JSON file")
+    args = parser.parse_args()
+
+    results = run_batch(args.runs, args.seed, args.workers, max_floors=args.max_floors, max_time=args.max_time, use_powerups=not args.no_powerups)
+    summary = summarize(results)
+    print(json.dumps(summary, indent=2))
+
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump({"summary": summary, "results": results}, output_file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+# spatial.py
+
+class TileIndex:
+    def __init__(self, entities=()):
+        self.cells = {}  # (x, y) -> entities standing on that tile
+        self.tiles = {}  # entity -> (x, y) it is filed under
+        for entity in entities:
+            self.add(entity, entity.x, entity.y)
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def __contains__(self, entity):
+        return entity in self.tiles
+
+    def add(self, entity, x, y):
+        self.tiles[entity] = (x, y)
+        self.cells.setdefault((x, y), []).append(entity)
+
+    def remove(self, entity):
+        tile = self.tiles.pop(entity, None)
+        if tile is not None:
+            cell = self.cells[tile]
+            cell.remove(entity)
+            if not cell:
+                del self.cells[tile]
+
+    def move(self, entity, x, y):
+        # Only touches the grid when the entity actually changed tiles
+        if self.tiles.get(entity) != (x, y):
+            self.remove(entity)
+            self.add(entity, x, y)
+
+    def at(self, x, y):
+        return self.cells.get((x, y), ())
+
+    def around(self, x, y, radius=1):
+        # Everything on the tiles within radius (a square) of a tile
+        found = []
+        for ny in range(y - radius, y + radius + 1):
+            for nx in range(x - radius, x + radius + 1):
+                cell = self.cells.get((nx, ny))
+                if cell:
+                    found.extend(cell)
+        return found
+
+    def in_range(self, first_col, first_row, last_col, last_row):
+        # Everything inside a tile rectangle (end exclusive), walking whichever is smaller: the rectangle or the occupied tiles
+        if len(self.cells) < (last_col - first_col) * (last_row - first_row):
+            return [
+                entity
+                for (x, y), cell in self.cells.items()
+                if first_col <= x < last_col and first_row <= y < last_row
+                for entity in cell
+            ]
+        found = []
+        for y in range(first_row, last_row):
+            for x in range(first_col, last_col):
+                cell = self.cells.get((x, y))
+                if cell:
+                    found.extend(cell)
+        return found
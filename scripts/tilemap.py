@@ -1,7 +1,9 @@
 # tilemap.py
 
-import pygame, random
+import pygame
+import numpy as np
 from settings import *
+from maze_grid import TILE_CODES, WALL, PATH, STRUCTURE, PORTAL, DOOR_LOCKED, DOOR_UNLOCKED, DOOR_INCORRECT
 
 FOUR_DIRECTIONS = ['up', 'right', 'down', 'left']
 ALL_DIRECTIONS = ['up', 'up_right', 'right', 'down_right', 'down', 'down_left', 'left', 'up_left']
@@ -26,68 +28,95 @@ connection_map = {
 }
 
 def generate_tiles(maze):
-    # Generates the correct tile sprites for the entire maze
+    # Generates the correct tile sprites for the entire maze from neighbour masks computed in one array pass
+    neighbor_masks = get_neighbor_masks(maze.codes).tolist()
     tile_map = []
-    for y, row in enumerate(maze):
+    for y, (code_row, mask_row) in enumerate(zip(maze.codes.tolist(), neighbor_masks)):
         tile_row = []
-        for x, tile in enumerate(row):
-            tile_sprite = get_tile_type(x, y, maze, tile)
-            tile_row.append(tile_sprite)
+        for x, (code, mask) in enumerate(zip(code_row, mask_row)):
+            tile_row.append(get_tile_sprite(x, y, code, mask))
         tile_map.append(tile_row)
     return tile_map
 
+def update_tiles(tile_map, maze, positions):
+    # Re-autotile only the changed (row, col) cells and their 8 neighbours
+    refreshed = set()
+    for row, col in positions:
+        for y in range(row - 1, row + 2):
+            for x in range(col - 1, col + 2):
+                if maze.in_bounds(x, y) and (y, x) not in refreshed:
+                    tile_map[y][x] = get_tile_type(x, y, maze, maze.tile(x, y))
+                    refreshed.add((y, x))
+    return refreshed
+
+def choose_variant(variants, x, y):
+    # Stable per coordinate, so re-autotiling a cell keeps the same sprite variant
+    return variants[((x * 73856093) ^ (y * 19349663)) % len(variants)]
+
 def get_tile_type(x, y, maze, tile_type):
-    # Guarantee a four-direction pattern match first
-    connections_four = get_tile_connections(x, y, maze, tile_type, directions=FOUR_DIRECTIONS)
-    type_key_four, rotation_four = get_pattern_with_rotation(connections_four, use_all_directions=False)
-
-    # Check if the four-direction pattern key exists in the appropriate tile set
-    tile_sprite = None
-    if tile_type == 'X':
-        tile_sprite = random.choice(WALL_TILES[type_key_four])
-    elif tile_type == 'O':
-        tile_sprite = random.choice(PATH_TILES[type_key_four])
-    elif tile_type in ['DL', 'DU', 'DI']:
-        door_state = {
-            'DL': 'locked',
-            'DU': 'unlocked',
-            'DI': 'incorrect'
-        }.get(tile_type)
-        if door_state in DOOR_TILES:
-            tile_sprite = random.choice(DOOR_TILES[door_state][type_key_four])
-    elif tile_type == 'S':
-        tile_sprite = random.choice(STRUCTURE_FLOOR_TILES[type_key_four])
-    elif tile_type == 'P':
-        tile_sprite = random.choice(STRUCTURE_PORTAL_TILES[type_key_four])
-
-    # Next, check for an eight-direction pattern to potentially replace the four-direction pattern
-    connections_eight = get_tile_connections(x, y, maze, tile_type, directions=ALL_DIRECTIONS)
-    type_key_eight, rotation_eight = get_pattern_with_rotation(connections_eight, use_all_directions=True)
-
-    # Update to eight-direction pattern if found in tile sets
-    if tile_type == 'X' and type_key_eight in WALL_TILES:
-        tile_sprite = random.choice(WALL_TILES[type_key_eight])
-        rotation_needed = rotation_eight
-    elif tile_type == 'O' and type_key_eight in PATH_TILES:
-        tile_sprite = random.choice(PATH_TILES[type_key_eight])
-        rotation_needed = rotation_eight
-    else:
-        # If no eight-direction pattern is found, use the four-direction pattern rotation
-        rotation_needed = rotation_four
-    
-    # Rotate the sprite as required by the calculated rotation
-    if tile_sprite is not None:
-        tile_sprite = pygame.transform.rotate(tile_sprite, rotation_needed)
+    return get_tile_sprite(x, y, TILE_CODES[tile_type], get_neighbor_mask(x, y, maze))
+
+def get_tile_sprite(x, y, code, mask):
+    # Look up the pattern and rotation for this tile class and neighbour mask
+    tile_set = TILE_CLASS_SETS.get(code)
+    if tile_set is None:
+        return None
+    type_key, rotation = get_pattern_table(code)[mask]
+    if type_key not in tile_set:
+        return None
+    return get_rotated_sprite(choose_variant(tile_set[type_key], x, y), rotation)
 
-    return tile_sprite
+def get_rotated_sprite(sprite, rotation):
+    # Identical tiles share one rotated Surface
+    cache_key = (sprite, rotation)
+    rotated_sprite = rotated_sprite_cache.get(cache_key)
+    if rotated_sprite is None:
+        with SURFACE_LOCK:
+            rotated_sprite = pygame.transform.rotate(sprite, rotation)
+        rotated_sprite_cache[cache_key] = rotated_sprite
+    return rotated_sprite
+
+def get_neighbor_masks(codes):
+    # Bit i is set when the neighbour in ALL_DIRECTIONS[i] holds the same tile, out of bounds never matches
+    rows, cols = codes.shape
+    padded = np.pad(codes.astype(np.int16), 1, constant_values=-1)
+    masks = np.zeros((rows, cols), dtype=np.uint8)
+    for bit, direction in enumerate(ALL_DIRECTIONS):
+        dx, dy = get_offset(direction)
+        neighbors = padded[1 + dy:1 + dy + rows, 1 + dx:1 + dx + cols]
+        masks |= (neighbors == codes).astype(np.uint8) << bit
+    return masks
 
-def get_tile_connections(x, y, maze, tile_type, directions):
-    connections = {}
-    for direction in directions:
+def get_neighbor_mask(x, y, maze):
+    mask = 0
+    code = maze.codes[y, x]
+    for bit, direction in enumerate(ALL_DIRECTIONS):
         dx, dy = get_offset(direction)
-        nx, ny = x + dx, y + dy
-        connections[direction] = (0 <= ny < len(maze) and 0 <= nx < len(maze[0]) and maze[ny][nx] == tile_type)
-    return connections
+        if maze.in_bounds(x + dx, y + dy) and maze.codes[y + dy, x + dx] == code:
+            mask |= 1 << bit
+    return mask
+
+def get_pattern_table(code):
+    # 256-entry table of (pattern, rotation) per neighbour mask, built once per tile class
+    table = pattern_tables.get(code)
+    if table is None:
+        table = [get_mask_pattern(code, mask) for mask in range(256)]
+        pattern_tables[code] = table
+    return table
+
+def get_mask_pattern(code, mask):
+    connections = {direction: bool(mask >> bit & 1) for bit, direction in enumerate(ALL_DIRECTIONS)}
+
+    # Guarantee a four-direction pattern match first
+    type_key, rotation = get_pattern_with_rotation(connections, use_all_directions=False)
+
+    # Walls and paths switch to an eight-direction pattern when their tile set has one
+    if code in (WALL, PATH):
+        type_key_eight, rotation_eight = get_pattern_with_rotation(connections, use_all_directions=True)
+        if type_key_eight in TILE_CLASS_SETS[code]:
+            type_key, rotation = type_key_eight, rotation_eight
+
+    return type_key, rotation % 360
 
 def get_pattern_with_rotation(connections, use_all_directions=False):
     # Generate connection pattern
@@ -133,4 +162,17 @@ def get_offset(direction):
         'left': (-1, 0),
         'up_left': (-1, -1)
     }
-    return offsets[direction]
\ No newline at end of file
+    return offsets[direction]
+
+# Tile sets per tile code, borders have none
+TILE_CLASS_SETS = {
+    WALL: WALL_TILES,
+    PATH: PATH_TILES,
+    STRUCTURE: STRUCTURE_FLOOR_TILES,
+    PORTAL: STRUCTURE_PORTAL_TILES,
+    DOOR_LOCKED: DOOR_TILES['locked'],
+    DOOR_UNLOCKED: DOOR_TILES['unlocked'],
+    DOOR_INCORRECT: DOOR_TILES['incorrect']
+}
+pattern_tables = {}
+rotated_sprite_cache = {}
@@ -1,6 +1,7 @@
 # utils.py
 
 import pygame
+from collections import OrderedDict
 
 def split_and_resize_sprite(path, tile_size=0):
     # Load the full sprite sheet
@@ -22,4 +23,69 @@ def split_and_resize_sprite(path, tile_size=0):
         for i in range(frame_count)
     ]
     
-    return frames
\ No newline at end of file
+    return frames
+
+def create_shadow(image, shadow_color=(0, 0, 0, 100)):
+    shadow = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+    shadow.fill(shadow_color)
+    shadow.blit(image, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+    return shadow
+
+def load_image(path, size, has_alpha=True):
+    # Scaled straight after loading so the full-size original is not kept around
+    image = pygame.image.load(path)
+    image = image.convert_alpha() if has_alpha else image.convert()
+    return pygame.transform.scale(image, size)
+
+def scale_image(image, size):
+    return pygame.transform.scale(image, size)
+
+def fade_image(image, opacity):
+    faded = image.copy()
+    faded.fill((255, 255, 255, opacity), special_flags=pygame.BLEND_RGBA_MULT)
+    return faded
+
+# Operations the derived surface cache can apply, each takes the source and the parameters
+SURFACE_OPERATIONS = {
+    "load": load_image,  # Source is a file path, loaded at the given size
+    "scale": scale_image,
+    "opacity": fade_image,
+    "shadow": create_shadow
+}
+
+class SurfaceCache:
+    def __init__(self, max_bytes):
+        # Least recently used surfaces are dropped first once the pixel data goes over max_bytes
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, source, operation, *params):
+        key = (source, operation, params)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = SURFACE_OPERATIONS[operation](source, *params)
+        self.entries[key] = surface
+        self.bytes += surface.get_pitch() * surface.get_height()
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.get_pitch() * evicted.get_height()
+            self.evictions += 1
+        return surface
+
+    def get_scaled_image(self, path, size, has_alpha=True):
+        # Image file scaled to size, neither the disk read nor the scaling repeats while it stays cached
+        return self.get(path, "load", size, has_alpha)
+
+    def get_stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries), "bytes": self.bytes, "evictions": self.evictions}
+
+SURFACE_CACHE = SurfaceCache(32 * 1024 * 1024)